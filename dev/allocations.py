@@ -0,0 +1,90 @@
+"""Count Vector2D/Rect/ContactResult/Collision allocations per frame.
+
+Runs the game headless with a fake clock and pseudo-random key presses, and
+reports how many of the small value objects the simulation creates per frame.
+
+    python dev/allocations.py [frames]
+"""
+import os
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pygame as pg  # noqa: E402
+
+pg.init()
+surface = pg.display.set_mode((1200, 800), pg.SRCALPHA)
+
+from game.game import Game  # noqa: E402
+from game.interfaces import Collision  # noqa: E402
+from game.physics import ContactResult  # noqa: E402
+from game.utils import Rect, Vector2D  # noqa: E402
+
+counts: Counter[str] = Counter()
+
+
+def count(cls: type) -> None:
+    new = cls.__new__
+
+    def counting_new(klass, *args, **kwargs):
+        counts[cls.__name__] += 1
+        if new is object.__new__:
+            return new(klass)
+        return new(klass, *args, **kwargs)
+
+    cls.__new__ = counting_new
+
+
+class Clock:
+    def tick(self, fps: int = 0) -> float:
+        return 1000 / 60
+
+
+class Done(Exception):
+    pass
+
+
+def end_game(*_):
+    raise Done
+
+
+def main(frames: int) -> None:
+    keys = random.Random(7)
+    pressed: set[int] = set()
+
+    class Pressed:
+        def __getitem__(self, key: int) -> bool:
+            return key in pressed
+
+    def get_pressed():
+        if keys.random() < 0.05:
+            pressed.clear()
+            pressed.update(
+                k
+                for k in (pg.K_LEFT, pg.K_RIGHT, pg.K_SPACE, pg.K_DOWN)
+                if keys.random() < 0.3
+            )
+        return Pressed()
+
+    game = Game(surface, end_game, seed=1, controls=get_pressed, music=False)
+    game.clock = Clock()
+    game.GAME_TIME = frames
+    for cls in (Vector2D, Rect, ContactResult, Collision):
+        count(cls)
+    try:
+        game.loop()
+    except Done:
+        pass
+    total = sum(counts.values())
+    for name, n in counts.most_common():
+        print(f"{name:>14}: {n / game.tick:8.2f} / frame")
+    print(f"{'total':>14}: {total / game.tick:8.2f} / frame over {game.tick} frames")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
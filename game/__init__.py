@@ -1,3 +1,4 @@
+from .startup import *
 from .endscreen import *
 from .game import *
 from .main import *
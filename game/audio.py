@@ -0,0 +1,108 @@
+"""Background music and sound effects.
+
+Music is streamed from disk by ``pg.mixer.music`` rather than decoded into a
+``Sound``. Effects are short decoded buffers played on a fixed pool of
+reserved channels; when every channel is busy the oldest voice is cut off.
+Everything is a no-op while the mixer is not initialised.
+"""
+from collections.abc import Callable
+
+import numpy as np
+import pygame as pg
+
+from .utils import DATA_DIR, Asset
+
+
+def make_sound(wave: np.ndarray) -> pg.mixer.Sound:
+    """A Sound from mono samples in [-1, 1], in the mixer's sample format."""
+    _, size, channels = pg.mixer.get_init()
+    if size == 32:
+        samples = wave.astype(np.float32)
+    else:
+        bits = abs(size)
+        peak = 2 ** (bits - 1) - 1
+        samples = wave * peak if size < 0 else (wave + 1) * peak
+        samples = samples.astype(f"{'i' if size < 0 else 'u'}{bits // 8}")
+    if channels > 1:
+        samples = np.repeat(samples[:, None], channels, axis=1)
+    return pg.sndarray.make_sound(np.ascontiguousarray(samples))
+
+
+def synth(
+    name: str,
+    duration: float,
+    frequency: Callable[[np.ndarray], np.ndarray],
+    noise: float = 0,
+    volume: float = 0.4,
+) -> Asset[pg.mixer.Sound]:
+    """A decaying tone whose frequency follows ``frequency(t)``."""
+
+    def decode():
+        rate = pg.mixer.get_init()[0]
+        t = np.arange(int(duration * rate)) / rate
+        phase = 2 * np.pi * np.cumsum(frequency(t)) / rate
+        wave = np.sin(phase) * (1 - noise)
+        if noise:
+            wave += np.random.default_rng(0).uniform(-1, 1, len(t)) * noise
+        return wave * volume * np.exp(-t * 6 / duration)
+
+    return Asset(name, decode, make_sound)
+
+
+class Audio:
+    # channels reserved for effects, so music and stray sounds never take them
+    EFFECT_CHANNELS = 4
+
+    def __init__(self, effects: dict[str, Asset[pg.mixer.Sound]]) -> None:
+        self.effects = effects
+        self.channels: list[pg.mixer.Channel] = []
+        # when each channel's current voice started, for stealing the oldest
+        self.started: list[int] = []
+
+    @property
+    def enabled(self) -> bool:
+        return pg.mixer.get_init() is not None
+
+    def play_music(self, path: str, loops: int = -1) -> None:
+        if not self.enabled:
+            return
+        pg.mixer.music.load(str(DATA_DIR / path))
+        pg.mixer.music.play(loops)
+
+    def stop_music(self) -> None:
+        if self.enabled:
+            pg.mixer.music.stop()
+
+    def play(self, name: str) -> pg.mixer.Channel | None:
+        """Play the effect ``name`` on a free channel, or the oldest one."""
+        if not self.enabled:
+            return None
+        if not self.channels:
+            self.__reserve()
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                break
+        else:
+            index = min(range(len(self.channels)), key=self.started.__getitem__)
+        channel = self.channels[index]
+        channel.play(self.effects[name].get())
+        self.started[index] = pg.time.get_ticks()
+        return channel
+
+    def __reserve(self) -> None:
+        count = self.EFFECT_CHANNELS
+        if pg.mixer.get_num_channels() < count:
+            pg.mixer.set_num_channels(count)
+        pg.mixer.set_reserved(count)
+        self.channels = [pg.mixer.Channel(i) for i in range(count)]
+        self.started = [0] * count
+
+
+AUDIO = Audio(
+    {
+        # a low thud with some grit when a monster hits the player
+        "hit": synth("hit", 0.25, lambda t: 110 - 60 * t, noise=0.35),
+        # a rising blip when a burger layer is caught
+        "catch": synth("catch", 0.15, lambda t: 660 + 2400 * t),
+    }
+)
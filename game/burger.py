@@ -1,11 +1,13 @@
-from contextlib import suppress
-from functools import partial
-
 import pygame as pg
 
 from game.interfaces.colliable import Colliable, CollisionCallback
 
-from .command import RemoveCallbackCMD, RemoveInstanceCMD, issue_command
+from .command import (
+    RemoveCallbackCMD,
+    RemoveInstanceCMD,
+    cancel_command,
+    issue_command,
+)
 from .interfaces import (
     Colliable,
     Collision,
@@ -14,22 +16,30 @@ from .interfaces import (
     Renderable,
 )
 from .physics import RigidBodyRect, handle_collision
-from .utils import DATA_DIR, Number, Rect, Vector2D, load_im
+from .utils import DATA_DIR, Asset, Camera, Number, Pool, Rect, Vector2D, lazy_im
 from .wall import Wall
 
 
 class BurgerLayer(PlayInstance):
-    def __init__(self, sprite: pg.Surface, name: str) -> None:
+    def __init__(self, sprite: Asset[pg.Surface], name: str) -> None:
+        self.rb = RigidBodyRect(Rect(0, 0, 0, 0), mass=4, gravity=True)
+        self.reset(sprite, name)
+
+    def reset(self, sprite: Asset[pg.Surface], name: str) -> None:
         self.dt = 0
-        self.sprite = sprite
+        self.sprite = sprite.get()
         self.name = name
-        self.width = sprite.get_width()
-        self.height = sprite.get_height()
-        self.rb = RigidBodyRect(
-            Rect(0, 0, self.width, self.height),
-            mass=4,
-            gravity=True,
-        )
+        self.width = self.sprite.get_width()
+        self.height = self.sprite.get_height()
+        # whether a burger holds this layer; held layers stay off the walls
+        self.held = False
+        self.rb.rect = Rect(0, 0, self.width, self.height)
+        self.rb.velocity = Vector2D(0, 0)
+        self.rb.acceleration = Vector2D(0, 0)
+        self.rb.gravity = True
+
+    def park(self) -> None:
+        self.rb.park()
 
     @property
     def pos(self) -> Vector2D[Number]:
@@ -42,23 +52,29 @@ class BurgerLayer(PlayInstance):
     def get_rect(self) -> Rect:
         return self.rb.rect
 
+    def get_previous_rect(self) -> Rect:
+        return self.rb.get_previous_rect()
+
+    def rewind(self, toi: float) -> None:
+        self.rb.rewind(toi)
+
     def get_velocity(self) -> "Vector2D":
         return self.rb.velocity
 
     def collide(self, other: Colliable) -> bool:
         return self.rb.collide(other)
 
-    def render(self, surface: pg.Surface) -> None:
-        surface.blit(self.sprite, tuple(self.pos))
-        self.rb.render(surface)
+    def render(self, surface: pg.Surface, camera: Camera) -> None:
+        surface.blit(self.sprite, camera.point_to_screen(*self.pos))
+        self.rb.render(surface, camera)
 
     def update(self, dt: float) -> None:
-        self.rb.update(dt)
         self.dt = dt
 
     def wall_collide(self, collision: Collision):
-        with suppress(Exception):
-            handle_collision(collision, self.rb, self.dt)
+        if self.held:
+            return
+        handle_collision(collision, self.rb, self.dt)
         issue_command(RemoveInstanceCMD(self))
 
     def __repr__(self) -> str:
@@ -71,10 +87,14 @@ class BurgerLayer(PlayInstance):
         return [(self.wall_collide, Wall)]
 
 
+BurgerLayer.POOL = Pool(BurgerLayer, capacity=64)
+
+# (sprite, name) of every kind of layer
 LAYERS = [
-    partial(BurgerLayer, load_im(path), path.stem)
+    (lazy_im(path.relative_to(DATA_DIR)), path.stem)
     for path in (DATA_DIR / "burger_layers").glob("*.png")
 ]
+LAYER_SPRITES = [sprite for sprite, _ in LAYERS]
 
 
 class Burger(Renderable, Colliable):
@@ -84,19 +104,16 @@ class Burger(Renderable, Colliable):
         self.layers: list[BurgerLayer] = []
 
     def move_to(self, pos: Vector2D[Number]) -> None:
-        self.rect = Rect(
-            pos.x,
-            pos.y,
-            self.rect.w,
-            self.rect.h,
-        )
         self.__arrange_layers(pos.x, pos.y)
 
     def add_layer(self, layer: BurgerLayer) -> None:
         if layer in self.layers:
             return
         layer.rb.gravity = False
+        layer.held = True
         self.layers.append(layer)
+        # it may have hit a wall earlier in the same tick
+        cancel_command(RemoveInstanceCMD(layer))
         issue_command(RemoveCallbackCMD(layer.wall_collide, layer, Wall))
         self.__arrange_layers(self.rect.x, self.rect.y)
 
@@ -109,16 +126,16 @@ class Burger(Renderable, Colliable):
     def collide(self, other: "Colliable") -> bool:
         return self.rect.collide(other.get_rect())
 
-    def render(self, surface: pg.Surface) -> None:
+    def render(self, surface: pg.Surface, camera: Camera) -> None:
         for layer in self.layers:
-            layer.render(surface)
+            layer.render(surface, camera)
 
     def __arrange_layers(self, x: Number, y: Number) -> None:
         h = 0
         for layer in self.layers:
-            h += layer.sprite.get_height()
-            layer.pos = Vector2D[Number](x, y - h)
-        self.rect = Rect(x, y - h, self.rect.w, h)
+            h += layer.height
+            layer.pos.set(x, y - h)
+        self.rect.set(x, y - h, self.rect.w, h)
 
     def layer_collide(self, collision: Collision) -> None:
         assert isinstance(collision.b, BurgerLayer)
@@ -1,16 +1,30 @@
+from collections.abc import Hashable
+
+from .entity import Handle
 from .interfaces import Renderable
 
 
 class Command:
     """Command class for all commands"""
 
+    @property
+    def key(self) -> Hashable:
+        """Commands with equal keys in one batch are applied once."""
+        return self
+
 
 class RemoveInstanceCMD(Command):
-    """Command for removing an instance"""
+    """Command for removing an instance, given itself or its handle"""
 
     def __init__(self, instance):
         self.instance = instance
 
+    @property
+    def key(self) -> Hashable:
+        if isinstance(self.instance, Handle):
+            return RemoveInstanceCMD, self.instance
+        return RemoveInstanceCMD, id(self.instance)
+
 
 class RemoveCallbackCMD(Command):
     """Command for removing a callback"""
@@ -20,16 +34,60 @@ class RemoveCallbackCMD(Command):
         self.instance = instance
         self.type = type
 
+    @property
+    def key(self) -> Hashable:
+        return RemoveCallbackCMD, self.callback, id(self.instance), self.type
+
 
 class AddInstanceCMD(Command):
-    """Command for adding an instance"""
+    """Command for adding one or more instances"""
 
-    def __init__(self, instance):
-        self.instance = instance
+    def __init__(self, *instances):
+        self.instances = instances
+
+    @property
+    def instance(self):
+        return self.instances[0]
+
+    @property
+    def key(self) -> Hashable:
+        return AddInstanceCMD, *map(id, self.instances)
+
+
+class CommandQueue:
+    """Commands issued during a tick, in order, with duplicates dropped."""
 
+    def __init__(self) -> None:
+        self.pending: dict[Hashable, Command] = {}
 
-commands: list[Command] = []
+    def issue(self, cmd: Command) -> None:
+        self.pending.setdefault(cmd.key, cmd)
+
+    def cancel(self, cmd: Command) -> None:
+        """Drop the pending command with the same key as ``cmd``, if any."""
+        self.pending.pop(cmd.key, None)
+
+    def drain(self) -> list[Command]:
+        drained = list(self.pending.values())
+        self.pending.clear()
+        return drained
+
+    def clear(self) -> None:
+        self.pending.clear()
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def __iter__(self):
+        return iter(self.pending.values())
+
+
+commands = CommandQueue()
 
 
 def issue_command(cmd: Command) -> None:
-    commands.append(cmd)
+    commands.issue(cmd)
+
+
+def cancel_command(cmd: Command) -> None:
+    commands.cancel(cmd)
@@ -1,6 +1,6 @@
-from .utils import load_im
+from .utils import lazy_im
 
 TITLE = "Catch the ball"
 SIZE = WIDTH, HEIGHT = 1200, 800
 FPS = 60
-ICON = load_im("icon.png")
+ICON = lazy_im("icon.png")
@@ -16,8 +16,9 @@ class EndScreen:
     def loop(self):
         while True:
             self.surface.fill((0, 0, 0))
-            w, h = ICON.get_size()
-            self.surface.blit(ICON, (self.cx - w // 2, self.cy - h))
+            icon = ICON.get()
+            w, h = icon.get_size()
+            self.surface.blit(icon, (self.cx - w // 2, self.cy - h))
             text(
                 self.surface,
                 self.title,
@@ -0,0 +1,138 @@
+from collections.abc import Iterator
+from enum import Flag, auto
+from typing import Generic, NamedTuple, TypeVar
+
+from .interfaces import Colliable, Renderable, Updatable
+from .utils import DenseSet, Pool
+
+T = TypeVar("T")
+
+
+class Capability(Flag):
+    NONE = 0
+    COLLIDE = auto()
+    RENDER = auto()
+    UPDATE = auto()
+    # a collider that never moves, so the space it takes is never free
+    STATIC = auto()
+
+
+# runtime Protocol checks inspect attributes on every call, so each class is
+# checked once, on its first instance
+CAPABILITIES: dict[type, Capability] = {}
+
+
+def capabilities(instance: object) -> Capability:
+    """What the systems of a game do with instances of ``type(instance)``."""
+    cls = type(instance)
+    result = CAPABILITIES.get(cls)
+    if result is None:
+        result = Capability.NONE
+        if isinstance(instance, Colliable):
+            result |= Capability.COLLIDE
+            if cls.STATIC:
+                result |= Capability.STATIC
+        if isinstance(instance, Renderable):
+            result |= Capability.RENDER
+        if isinstance(instance, Updatable) and not getattr(cls.update, "noop", False):
+            result |= Capability.UPDATE
+        CAPABILITIES[cls] = result
+    return result
+
+
+class Handle(NamedTuple):
+    """Refers to an entity without keeping it alive.
+
+    A slot's generation is bumped when its entity is removed, so handles
+    to the old entity stop resolving instead of finding whatever reuses it.
+    """
+
+    index: int
+    generation: int
+
+
+class Archetype(Generic[T]):
+    """Live instances of one class, which all share its capabilities."""
+
+    def __init__(self, cls: type[T], capabilities: Capability) -> None:
+        self.cls = cls
+        self.capabilities = capabilities
+        self.members = DenseSet[T]()
+        # despawned members are handed back to it for reuse
+        self.pool: Pool[T] | None = getattr(cls, "POOL", None)
+
+    def __repr__(self) -> str:
+        name = self.cls.__name__
+        return f"Archetype({name}, {self.capabilities}, {len(self.members)})"
+
+
+class Entities(Generic[T]):
+    """Live instances of a game, grouped by class into archetypes.
+
+    Each instance is addressed by a generational handle while it is live.
+    """
+
+    def __init__(self) -> None:
+        self.slots: list[T | None] = []
+        self.generations: list[int] = []
+        self.free: list[int] = []
+        # id(instance) -> its handle, while it is live
+        self.handles: dict[int, Handle] = {}
+        self.archetypes: dict[type, Archetype[T]] = {}
+
+    def add(self, instance: T) -> Handle:
+        if id(instance) in self.handles:
+            raise ValueError(f"{instance} is already live")
+        if self.free:
+            index = self.free.pop()
+        else:
+            index = len(self.slots)
+            self.slots.append(None)
+            self.generations.append(0)
+        self.slots[index] = instance
+        self.archetype(instance).members.add(instance)
+        handle = self.handles[id(instance)] = Handle(index, self.generations[index])
+        return handle
+
+    def remove(self, instance: T) -> Handle:
+        handle = self.handles.pop(id(instance), None)
+        if handle is None:
+            raise ValueError(f"{instance} is not live")
+        self.slots[handle.index] = None
+        self.archetypes[type(instance)].members.remove(instance)
+        self.generations[handle.index] += 1
+        self.free.append(handle.index)
+        return handle
+
+    def get(self, handle: Handle) -> T | None:
+        """The instance ``handle`` refers to, or None once it is removed."""
+        if self.generations[handle.index] != handle.generation:
+            return None
+        return self.slots[handle.index]
+
+    def handle(self, instance: T) -> Handle | None:
+        return self.handles.get(id(instance))
+
+    def archetype(self, instance: T) -> Archetype[T]:
+        archetype = self.archetypes.get(type(instance))
+        if archetype is None:
+            archetype = self.archetypes[type(instance)] = Archetype(
+                type(instance), capabilities(instance)
+            )
+        return archetype
+
+    def query(self, cls: type[T]) -> Iterator[T]:
+        """Live instances of exactly ``cls``."""
+        archetype = self.archetypes.get(cls)
+        if archetype is not None:
+            yield from archetype.members
+
+    def __contains__(self, instance: object) -> bool:
+        return id(instance) in self.handles
+
+    def __iter__(self) -> Iterator[T]:
+        for archetype in self.archetypes.values():
+            yield from archetype.members
+
+    def __len__(self) -> int:
+        return len(self.handles)
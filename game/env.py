@@ -0,0 +1,319 @@
+"""The game as a step/reset environment, for running many simulated sessions.
+
+Each action is a mask of held keys, one bit per key in ``replay.KEYS``. The
+physics world and command queue are shared by every game in a process, so a
+process runs one game at a time; ``VectorEnv`` runs one per worker process
+and exchanges actions, observations and rewards through shared memory.
+
+    python -m game.env --envs 1 2 4 --ticks 2000 --horizon 16
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import multiprocessing as mp
+import time
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pygame as pg
+
+from .burger import BurgerLayer
+from .command import commands
+from .constants import HEIGHT, SIZE, WIDTH
+from .game import Game
+from .monster import Monster
+from .replay import KEYS, KeyMask
+
+
+class GameEnv:
+    """One game, advanced a tick per ``step``.
+
+    An observation holds the player's position, velocity, health and score,
+    the time left, then the offset to each of the ``NEAREST`` closest
+    monsters and loose burger layers with a flag for whether it exists.
+    Positions are scaled by the screen size. The reward is the score gained
+    less the health lost on that tick.
+    """
+
+    NEAREST = 4
+    ACTIONS = 1 << len(KEYS)
+    OBSERVATION_SIZE = 7 + 2 * NEAREST * 3
+
+    def __init__(
+        self,
+        surface: pg.Surface | None = None,
+        burger_ticks: int = Game.BURGER_LAYER_TICKS,
+        monster_ticks: int = Game.MONSTER_TICKS,
+        max_ticks: int = Game.GAME_TIME,
+        render: bool = False,
+    ) -> None:
+        if surface is None:
+            pg.init()
+            surface = pg.Surface(SIZE, pg.SRCALPHA)
+        self.surface = surface
+        self.burger_ticks = burger_ticks
+        self.monster_ticks = monster_ticks
+        self.max_ticks = max_ticks
+        self.render = render
+        self.dt = 1 / Game.TICK_RATE
+        self.keys = KeyMask()
+        self.game: Game | None = None
+        self.scale = np.array((WIDTH, HEIGHT), dtype=np.float32)
+
+    def reset(
+        self, seed: int | None = None, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        if self.game is not None:
+            # bodies of the previous game are released once it is collected
+            self.game = None
+            commands.clear()
+            gc.collect()
+        game = Game(self.surface, lambda *_: None, seed, self.keys, music=False)
+        game.BURGER_LAYER_TICKS = self.burger_ticks
+        game.MONSTER_TICKS = self.monster_ticks
+        self.game = game
+        return self.observe(out)
+
+    def step(
+        self, action: int, out: np.ndarray | None = None
+    ) -> tuple[np.ndarray, float, bool]:
+        """Hold the keys in ``action`` for a tick.
+
+        Returns the observation, the reward and whether the game is over.
+        """
+        game, player = self.game, self.game.player
+        score, health = player.score, player.health
+        self.keys.mask = action
+        game.step(self.dt, self.render)
+        reward = player.score - score + player.health - health
+        done = player.health <= 0 or game.tick >= self.max_ticks
+        return self.observe(out), float(reward), done
+
+    def observe(self, out: np.ndarray | None = None) -> np.ndarray:
+        if out is None:
+            out = np.empty(self.OBSERVATION_SIZE, dtype=np.float32)
+        game, player = self.game, self.game.player
+        origin = np.array(player.rb.position, dtype=np.float32)
+        out[0:2] = origin / self.scale
+        out[2:4] = np.array(player.rb.velocity, dtype=np.float32) / self.scale
+        out[4] = player.health / 100
+        out[5] = player.score / 100
+        out[6] = 1 - game.tick / self.max_ticks
+        start = 7
+        monsters = [monster.get_rect() for monster in game.entities.query(Monster)]
+        # layers already on the burger are the player's
+        layers = [
+            layer.get_rect()
+            for layer in game.entities.query(BurgerLayer)
+            if not layer.held
+        ]
+        for rects in (monsters, layers):
+            positions = [(rect.x, rect.y) for rect in rects]
+            self.__nearest(origin, positions, out[start : start + 3 * self.NEAREST])
+            start += 3 * self.NEAREST
+        return out
+
+    def __nearest(
+        self, origin: np.ndarray, positions: list[tuple[float, float]], out: np.ndarray
+    ) -> None:
+        out[:] = 0
+        if not positions:
+            return
+        offsets = (np.array(positions, dtype=np.float32) - origin) / self.scale
+        order = np.argsort((offsets**2).sum(axis=1))[: self.NEAREST]
+        rows = out.reshape(self.NEAREST, 3)
+        rows[: len(order), :2] = offsets[order]
+        rows[: len(order), 2] = 1
+
+
+class Buffers:
+    """Arrays of every environment of a VectorEnv, laid out in one block.
+
+    Each has a row per tick of the longest rollout, then one per environment.
+    """
+
+    def __init__(self, buffer: memoryview, envs: int, horizon: int) -> None:
+        size = GameEnv.OBSERVATION_SIZE
+        offset = 0
+        self.observations = np.ndarray(
+            (horizon, envs, size), np.float32, buffer, offset
+        )
+        offset += self.observations.nbytes
+        self.rewards = np.ndarray((horizon, envs), np.float32, buffer, offset)
+        offset += self.rewards.nbytes
+        self.actions = np.ndarray((horizon, envs), np.uint8, buffer, offset)
+        offset += self.actions.nbytes
+        self.dones = np.ndarray((horizon, envs), np.bool_, buffer, offset)
+
+    @staticmethod
+    def nbytes(envs: int, horizon: int) -> int:
+        return horizon * envs * (GameEnv.OBSERVATION_SIZE * 4 + 4 + 1 + 1)
+
+
+def worker(
+    index: int, name: str, envs: int, horizon: int, conn: Connection, kwargs: dict
+) -> None:
+    memory = SharedMemory(name)
+    buffers = Buffers(memory.buf, envs, horizon)
+    env = GameEnv(**kwargs)
+    observations = list(buffers.observations[:, index])
+    actions, rewards, dones = (
+        buffers.actions[:, index],
+        buffers.rewards[:, index],
+        buffers.dones[:, index],
+    )
+    try:
+        while True:
+            error = None
+            try:
+                match conn.recv():
+                    case ("step", ticks):
+                        for tick in range(ticks):
+                            observation = observations[tick]
+                            _, reward, done = env.step(int(actions[tick]), observation)
+                            rewards[tick] = reward
+                            dones[tick] = done
+                            if done:
+                                env.reset(out=observation)
+                    case ("reset", seed):
+                        env.reset(seed, observations[0])
+                    case "close":
+                        break
+            except Exception as e:
+                # the game is left broken; the parent raises and closes
+                error = e
+            conn.send(error)
+    finally:
+        del buffers, observations, actions, rewards, dones
+        memory.close()
+
+
+class VectorEnv:
+    """``envs`` games stepped together, each in its own worker process.
+
+    ``reset``, ``step`` and ``rollout`` return views of the shared buffers,
+    which the next call overwrites. A game that is done is reset in the same
+    step, so the observation returned for it is the first of its next game.
+
+    Each call costs a message to and from every worker. ``rollout`` runs up
+    to ``horizon`` ticks for that cost, with actions chosen up front.
+    """
+
+    def __init__(self, envs: int, horizon: int = 1, **kwargs) -> None:
+        self.envs = envs
+        self.horizon = horizon
+        self.memory = SharedMemory(create=True, size=Buffers.nbytes(envs, horizon))
+        self.buffers = Buffers(self.memory.buf, envs, horizon)
+        # SDL does not survive a fork, so workers start from a fresh interpreter
+        context = mp.get_context("spawn")
+        self.conns: list[Connection] = []
+        self.workers: list[mp.Process] = []
+        for index in range(envs):
+            conn, child = context.Pipe()
+            process = context.Process(
+                target=worker,
+                args=(index, self.memory.name, envs, horizon, child, kwargs),
+                daemon=True,
+            )
+            process.start()
+            self.conns.append(conn)
+            self.workers.append(process)
+
+    def reset(self, seed: int | None = None) -> np.ndarray:
+        """Reset every game, the ``i``-th with ``seed + i`` when seeded."""
+        for index, conn in enumerate(self.conns):
+            conn.send(("reset", None if seed is None else seed + index))
+        self.__wait()
+        return self.buffers.observations[0]
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Apply one action per game; returns (observations, rewards, dones)."""
+        observations, rewards, dones = self.rollout(np.asarray(actions)[None])
+        return observations[0], rewards[0], dones[0]
+
+    def rollout(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Apply ``actions[t, i]`` to game ``i`` on its ``t``-th tick.
+
+        Returns (observations, rewards, dones), each with a row per tick.
+        """
+        ticks = len(actions)
+        if ticks > self.horizon:
+            raise ValueError(f"{ticks} ticks is more than the horizon {self.horizon}")
+        buffers = self.buffers
+        buffers.actions[:ticks] = actions
+        for conn in self.conns:
+            conn.send(("step", ticks))
+        self.__wait()
+        return (
+            buffers.observations[:ticks],
+            buffers.rewards[:ticks],
+            buffers.dones[:ticks],
+        )
+
+    def close(self) -> None:
+        if not self.workers:
+            return
+        for conn in self.conns:
+            conn.send("close")
+        for process in self.workers:
+            process.join()
+        self.workers.clear()
+        del self.buffers
+        self.memory.close()
+        self.memory.unlink()
+
+    def __wait(self) -> None:
+        errors = [conn.recv() for conn in self.conns]
+        for index, error in enumerate(errors):
+            if error is not None:
+                raise RuntimeError(f"environment {index} failed") from error
+
+    def __enter__(self) -> "VectorEnv":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, nargs="+", default=[1, os.cpu_count()])
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument(
+        "--horizon", type=int, default=1, help="ticks run per message to a worker"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for envs in args.envs:
+        with VectorEnv(envs, args.horizon) as env:
+            env.reset(args.seed)
+            actions = np.zeros((args.horizon, envs), dtype=np.uint8)
+            start = time.perf_counter()
+            for _ in range(args.ticks // args.horizon):
+                # hold keys for a while, as a player would
+                for tick in range(args.horizon):
+                    change = rng.random(envs) < 1 / 20
+                    actions[tick] = actions[tick - 1]
+                    actions[tick, change] = rng.integers(
+                        GameEnv.ACTIONS, size=change.sum()
+                    )
+                env.rollout(actions)
+            elapsed = time.perf_counter() - start
+        ticks = args.ticks // args.horizon * args.horizon
+        print(
+            f"envs={envs} horizon={args.horizon}"
+            f" {envs * ticks / elapsed:.1f} ticks/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
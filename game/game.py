@@ -1,26 +1,22 @@
 import random
-from collections.abc import Callable
-from contextlib import suppress
+from collections.abc import Callable, Sequence
 from logging import getLogger
 from typing import TypeVar
 
 import pygame as pg
 
-from .burger import LAYERS
+from .audio import AUDIO
+from .burger import LAYER_SPRITES, LAYERS, BurgerLayer
 from .command import AddInstanceCMD, RemoveCallbackCMD, RemoveInstanceCMD, commands
+from .entity import Capability, Entities, Handle
 from .constants import FPS, HEIGHT, WIDTH
-from .interfaces import (
-    Colliable,
-    CollisionHandler,
-    PlayInstance,
-    Renderable,
-    RenderHandler,
-    Updatable,
-    UpdateHandler,
-)
+from .hud import Hud, ProfilerOverlay
+from .interfaces import CollisionHandler, PlayInstance, RenderHandler, UpdateHandler
+from .level import lazy_level
 from .monster import Monster
+from .physics import WORLD
 from .player import Player
-from .utils import Vector2D, make_rect, load_audio
+from .utils import PROFILER, Camera, DenseSet, FreeSpace, Vector2D, make_rect
 from .wall import Wall
 
 T = TypeVar("T", bound=PlayInstance)
@@ -33,40 +29,111 @@ class Game:
     MONSTER_TICKS = 300
     GAME_TIME = 60 * 60
     GRID_SIZE = 48
-
-    def __init__(self, surface: pg.Surface, end_game: Callable[[str, int, str], None]):
+    # simulation ticks per second, independent of the display rate
+    TICK_RATE = FPS
+    # after a stall, run at most this many ticks per frame and drop the rest
+    MAX_CATCH_UP_TICKS = 5
+    # restore and present only the areas that changed each frame
+    DIRTY_RENDERING = True
+    BGM = "bgm.mp3"
+    LEVEL = lazy_level("levels/default.txt")
+    # toggles the profiler and its overlay
+    PROFILER_KEY = pg.K_F3
+    # loaded in the background while the menu is shown
+    ASSETS = (
+        *AUDIO.effects.values(),
+        Wall.TEXTURE,
+        LEVEL,
+        Monster.SPRITE,
+        *Player.SPRITES.values(),
+        *LAYER_SPRITES,
+    )
+
+    def __init__(
+        self,
+        surface: pg.Surface,
+        end_game: Callable[[str, int, str], None],
+        seed: int | None = None,
+        controls: Callable[[], Sequence[bool]] = pg.key.get_pressed,
+        music: bool = True,
+    ):
         self.surface = surface
-        self.collisions = CollisionHandler()
-        self.renders = RenderHandler()
+        self.collisions = CollisionHandler(Game.GRID_SIZE)
+        self.camera = Camera(surface.get_size())
+        self.renders = RenderHandler(
+            self.DIRTY_RENDERING, self.BACKGROUND_COLOR, self.camera
+        )
         self.updates = UpdateHandler()
+        self.physics = WORLD
+        self.entities = Entities()
         self.end_game = end_game
+        # kept so that a session can be recorded and replayed
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.controls = controls
+        self.profiler = PROFILER
 
         self.clock = pg.time.Clock()
-        self.walls: list[Wall] = []
+        self.walls = DenseSet[Wall]()
         self.__init_scene()
         self.tick = 0
+        # simulated time owed to the clock, always less than a tick after a frame
+        self.lag = 0.0
 
-        self.bgm = load_audio("bgm.mp3")
-        self.bgm.play(-1)
+        if music:
+            AUDIO.play_music(Game.BGM)
 
     def loop(self):
+        dt = 1 / self.TICK_RATE
         while True:
-            dt = self.clock.tick(FPS) / 1000
-            self.tick += 1
-            self.surface.fill(self.BACKGROUND_COLOR)
-            self.__update_state(dt)
-            self.__spawn_burger()
-            self.__spawn_monster()
+            with self.profiler.frame():
+                self.lag += self.clock.tick(FPS) / 1000
+                ticks = 0
+                while self.lag >= dt and ticks < self.MAX_CATCH_UP_TICKS:
+                    self.step(dt, render=False)
+                    self.lag -= dt
+                    ticks += 1
+                if self.lag >= dt:
+                    self.lag %= dt
+                with self.profiler.span("render"):
+                    self.render(self.lag / dt)
+                with self.profiler.span("present"):
+                    self.renders.present()
+                self.__handle_end_game()
+
+    def step(self, dt: float, render: bool = True) -> None:
+        """Advance the game by one tick of ``dt`` seconds."""
+        self.tick += 1
+        with self.profiler.span("update"):
+            self.updates.update(dt)
+        # after the updates, so forces applied this tick move bodies this tick
+        with self.profiler.span("physics"):
+            self.physics.update(dt)
+            self.player.carry_burger()
+        with self.profiler.span("collisions"):
+            self.collisions.update(dt)
+        if render:
+            with self.profiler.span("render"):
+                self.render()
+        with self.profiler.span("spawn"):
+            if self.tick % self.BURGER_LAYER_TICKS == 0:
+                self.spawn_burger()
+            if self.tick % self.MONSTER_TICKS == 0:
+                self.spawn_monster()
+        with self.profiler.span("commands"):
             self.__handle_cmd()
-            self.__render_player_status()
-            pg.display.flip()
-            self.__handle_end_game()
+
+    def render(self, alpha: float = 1.0) -> None:
+        """Draw the scene ``alpha`` of the way from the previous tick."""
+        with self.physics.interpolated(alpha):
+            self.renders.render(self.surface, alpha)
 
     def __enter__(self):
         self.clock = pg.time.Clock()
-        self.walls = []
+        self.walls = DenseSet[Wall]()
         self.__init_scene()
         self.tick = 0
+        self.lag = 0.0
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
@@ -85,120 +152,91 @@ class Game:
         for evt in pg.event.get():
             if evt.type == pg.QUIT:
                 pg.quit()
+            elif evt.type == pg.KEYDOWN and evt.key == self.PROFILER_KEY:
+                self.profiler.enabled = not self.profiler.enabled
         if self.player.health <= 0:
             self.end_game("You lose!", self.player.score, "You died!")
 
-    def __render_player_status(self):
-        self.__put_text(f"Score: {self.player.score}", Vector2D(Game.GRID_SIZE + 16, 0))
-        self.__put_text(
-            f"Health: {self.player.health}", Vector2D(Game.GRID_SIZE + 16, 32)
-        )
-        self.__put_text(
-            f"Time: {self.GAME_TIME - self.tick}", Vector2D(Game.GRID_SIZE + 16, 64)
-        )
-
-    def __put_text(self, text: str, pos: Vector2D, size: int = 32) -> None:
-        font = pg.font.SysFont("Cascadia Code", size)
-        self.surface.blit(font.render(text, True, (0, 0, 0)), (pos.x, pos.y))
-
-    def __update_state(self, dt):
-        self.updates.update(dt)
-        self.collisions.update(dt)
-        self.renders.render(self.surface)
-
     def __handle_cmd(self):
-        for cmd in commands:
+        # duplicates were coalesced when issued; commands about instances that
+        # are already gone, or already live, are stale rather than errors
+        for cmd in commands.drain():
             match cmd:
+                case RemoveInstanceCMD(instance=Handle() as handle):
+                    instance = self.entities.get(handle)
+                    if instance is not None:
+                        self.__remove_instance(instance)
                 case RemoveInstanceCMD():
-                    with suppress(ValueError):
+                    if cmd.instance in self.entities:
                         self.__remove_instance(cmd.instance)
                 case RemoveCallbackCMD():
-                    with suppress(ValueError):
+                    if cmd.instance in self.entities:
                         self.collisions.unregister(cmd.callback, cmd.instance, cmd.type)
                 case AddInstanceCMD():
-                    with suppress(ValueError):
-                        self.__add_instance(cmd.instance)
+                    for instance in cmd.instances:
+                        if instance not in self.entities:
+                            self.__add_instance(instance)
                 case _:
                     raise ValueError(f"Unknown command {cmd}")
-        commands.clear()
-
-    def __spawn_burger(self):
-        if self.tick % self.BURGER_LAYER_TICKS == 0:
-            layer = random.choice(LAYERS)()
-            layer.pos = Vector2D(random.randint(0, WIDTH), 0)
-            self.__add_instance(layer)
-
-    def __spawn_monster(self):
-        if self.tick % self.MONSTER_TICKS == 0:
-            monster = self.__add_instance(Monster())
-            while True:
-                x = random.randint(
-                    Game.GRID_SIZE, WIDTH - Game.GRID_SIZE - monster.rb.rect.width
-                )
-                y = random.randint(0, HEIGHT)
-                if any(
-                    wall.get_rect().collide(
-                        make_rect(
-                            x,
-                            y,
-                            monster.rb.rect.width,
-                            monster.rb.rect.height,
-                        )
-                    )
-                    for wall in self.walls
-                ):
-                    continue
-                break
-            monster.rb.position = Vector2D(x, y)
-            self.__add_instance(monster)
+
+    def spawn_burger(self) -> None:
+        layer = BurgerLayer.POOL.acquire(*self.rng.choice(LAYERS))
+        layer.pos = Vector2D(self.rng.randint(0, WIDTH), 0)
+        self.__add_instance(layer)
+
+    def spawn_monster(self) -> None:
+        position = self.free_space.sample(self.rng)
+        if position is None:
+            # the walls leave no room for another monster
+            return
+        monster = Monster.POOL.acquire(self.rng)
+        monster.rb.position = Vector2D(*position)
+        self.__add_instance(monster)
 
     def __init_scene(self):
-        self.player = self.__add_instance(Player())
-        self.player.rb.position = Vector2D(WIDTH / 2, 0)
-        self.bottom_wall = self.__wall(0, HEIGHT - Game.GRID_SIZE, WIDTH, 1024)
-        self.left_wall = self.__wall(Game.GRID_SIZE - 1024, -1024, 1024, HEIGHT + 1024)
-        self.right_wall = self.__wall(
-            WIDTH - Game.GRID_SIZE, -1024, 1024, HEIGHT + 1024
+        # where a monster can spawn without overlapping a wall
+        self.free_space = FreeSpace(
+            make_rect(Game.GRID_SIZE, 0, WIDTH - 2 * Game.GRID_SIZE, HEIGHT),
+            Game.GRID_SIZE,
+            Monster.SPRITE.get().get_size(),
         )
-        self.top_wall = self.__wall(-256, -1024, WIDTH, 1024)
-
-        self.__grid_wall(2, 12, 8, 1)
-        self.__grid_wall(16, 10, 4, 1)
-        self.__grid_wall(8, 8, 5, 1)
-        self.__grid_wall(12, 4, 6, 1)
-
-    def __grid_wall(self, x, y, w, h):
-        return self.__wall(
-            x * Game.GRID_SIZE,
-            y * Game.GRID_SIZE,
-            w * Game.GRID_SIZE,
-            h * Game.GRID_SIZE,
-            True,
-        )
-
-    def __wall(self, x, y, w, h, sticky=False):
-        result = self.__add_instance(Wall(make_rect(x, y, w, h), sticky))
-        self.walls.append(result)
-        return result
+        self.player = self.__add_instance(Player(controls=self.controls, rng=self.rng))
+        self.player.rb.position = Vector2D(WIDTH / 2, 0)
+        for wall in Game.LEVEL.get().walls():
+            self.__add_instance(wall)
+        self.__add_instance(Hud(self, Game.GRID_SIZE + 16))
+        self.__add_instance(ProfilerOverlay(self.profiler, WIDTH - Game.GRID_SIZE))
 
     def __add_instance(self, instance: T) -> T:
-        if isinstance(instance, Colliable):
+        self.entities.add(instance)
+        capabilities = self.entities.archetype(instance).capabilities
+        if Capability.COLLIDE in capabilities:
             self.collisions.add(instance)
             for cb, type in instance.get_callbacks():
                 self.collisions.register(cb, instance, type)
-        if isinstance(instance, Renderable):
+        if Capability.RENDER in capabilities:
             self.renders.add(instance)
-        if isinstance(instance, Updatable):
+        if Capability.UPDATE in capabilities:
             self.updates.add(instance)
+        if Capability.STATIC in capabilities:
+            self.walls.add(instance)
+            self.free_space.block(instance.get_rect())
         return instance
 
     def __remove_instance(self, instance: T) -> T:
-        if isinstance(instance, Colliable):
+        archetype = self.entities.archetype(instance)
+        capabilities = archetype.capabilities
+        self.entities.remove(instance)
+        if Capability.COLLIDE in capabilities:
             self.collisions.remove(instance)
-            for cb, type in instance.get_callbacks():
-                self.collisions.unregister(cb, instance, type)
-        if isinstance(instance, Renderable):
+            self.collisions.unregister_all(instance)
+        if Capability.RENDER in capabilities:
             self.renders.remove(instance)
-        if isinstance(instance, Updatable):
+        if Capability.UPDATE in capabilities:
             self.updates.remove(instance)
+        if Capability.STATIC in capabilities:
+            self.walls.remove(instance)
+            self.free_space.unblock(instance.get_rect())
+        if archetype.pool is not None:
+            archetype.pool.release(instance)
         return instance
@@ -0,0 +1,164 @@
+"""Run the game without a window, clock or audio, and time it.
+
+Every run is deterministic for a given seed: the game uses a fixed ``dt``,
+a seeded RNG and scripted input.
+
+    python -m game.headless --ticks 600 --entities 10 100 1000 10000
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import random
+from dataclasses import dataclass
+
+import numpy as np
+import pygame as pg
+
+from .burger import BurgerLayer
+from .command import commands
+from .constants import FPS, SIZE
+from .game import Game
+from .monster import Monster
+from .particle import ExplosionEffect
+from .utils import PROFILER, PoolStats
+
+POOLED = (Monster, BurgerLayer, ExplosionEffect)
+
+KEYS = (pg.K_LEFT, pg.K_RIGHT, pg.K_SPACE, pg.K_DOWN)
+
+
+class ScriptedInput:
+    """Stands in for ``pg.key.get_pressed``, holding random keys for a while."""
+
+    def __init__(self, seed: int | None = None, hold: int = 20):
+        self.rng = random.Random(seed)
+        self.hold = hold
+        self.pressed: set[int] = set()
+        self.remaining = 0
+
+    def __call__(self) -> "ScriptedInput":
+        if self.remaining <= 0:
+            self.pressed = {key for key in KEYS if self.rng.random() < 0.3}
+            self.remaining = self.rng.randint(1, self.hold)
+        self.remaining -= 1
+        return self
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.pressed
+
+
+@dataclass
+class Report:
+    entities: int
+    ticks: int
+    frames: np.ndarray
+    phases: dict[str, np.ndarray]
+    # cumulative over every run in this process
+    pools: dict[str, PoolStats]
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.frames.sum()
+
+    def __str__(self) -> str:
+        p50, p95, p99 = np.percentile(self.frames * 1000, (50, 95, 99))
+        lines = [
+            f"entities={self.entities} ticks={self.ticks}"
+            f" {self.ticks_per_second:.1f} ticks/s"
+            f" frame p50={p50:.3f}ms p95={p95:.3f}ms p99={p99:.3f}ms"
+        ]
+        for name, times in self.phases.items():
+            lines.append(f"  {name:>20}: {times.mean() * 1000:8.3f} ms/tick")
+        for name, stats in self.pools.items():
+            lines.append(f"  pool {name}: {stats}")
+        return "\n".join(lines)
+
+
+def simulate(
+    surface: pg.Surface,
+    ticks: int,
+    entities: int = 0,
+    burger_ticks: int = Game.BURGER_LAYER_TICKS,
+    monster_ticks: int = Game.MONSTER_TICKS,
+    seed: int = 0,
+    render: bool = True,
+    dt: float = 1 / FPS,
+    detailed: bool = False,
+) -> Report:
+    """Run ``ticks`` ticks of a game with ``entities`` monsters spawned up front.
+
+    The profiler is left holding every tick, for exporting.
+    """
+    game = Game(surface, lambda *_: None, seed, ScriptedInput(seed), music=False)
+    game.BURGER_LAYER_TICKS = burger_ticks
+    game.MONSTER_TICKS = monster_ticks
+    # the player must outlive the run however crowded the scene gets
+    game.player.health = float("inf")
+    for _ in range(entities):
+        game.spawn_monster()
+
+    PROFILER.clear(ticks)
+    PROFILER.enabled, PROFILER.detailed = True, detailed
+    for _ in range(ticks):
+        with PROFILER.frame():
+            game.step(dt, render)
+    PROFILER.enabled = False
+
+    phases = PROFILER.durations()
+    frames = phases.pop(PROFILER.FRAME)
+    pools = {cls.__name__: cls.POOL.stats for cls in POOLED}
+    return Report(entities, ticks, frames, phases, pools)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument(
+        "--entities",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="monsters spawned before the run; several values run a sweep",
+    )
+    parser.add_argument("--burger-ticks", type=int, default=Game.BURGER_LAYER_TICKS)
+    parser.add_argument("--monster-ticks", type=int, default=Game.MONSTER_TICKS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-render", dest="render", action="store_false")
+    parser.add_argument(
+        "--detail", action="store_true", help="also time inside the handlers"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="write the last run as Chrome trace-event JSON (chrome://tracing)",
+    )
+    args = parser.parse_args()
+
+    pg.init()
+    surface = pg.display.set_mode(SIZE, pg.SRCALPHA)
+    for entities in args.entities:
+        print(
+            simulate(
+                surface,
+                args.ticks,
+                entities,
+                args.burger_ticks,
+                args.monster_ticks,
+                args.seed,
+                args.render,
+                detailed=args.detail,
+            )
+        )
+        if args.trace:
+            PROFILER.export(args.trace)
+        # bodies of the previous run live in the shared physics world
+        commands.clear()
+        gc.collect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import pygame as pg
+
+from .interfaces import Bounded, Renderable, RenderLayer
+from .utils import Camera, GlyphAtlas, Profiler
+
+
+class Hud(Renderable, Bounded):
+    """Score, health and remaining time drawn over the world."""
+
+    RENDER_LAYER = RenderLayer.HUD
+
+    def __init__(self, game, x: int) -> None:
+        self.game = game
+        self.x = x
+        self.font = GlyphAtlas("Cascadia Code", 32, (0, 0, 0))
+
+    def lines(self) -> list[str]:
+        player = self.game.player
+        return [
+            f"Score: {player.score}",
+            f"Health: {player.health}",
+            f"Time: {self.game.GAME_TIME - self.game.tick}",
+        ]
+
+    def render(self, surface: pg.Surface, camera: Camera) -> None:
+        for i, line in enumerate(self.lines()):
+            self.font.render(surface, line, (self.x, i * 32))
+
+    def get_bounds(self) -> pg.Rect:
+        width = max(self.font.size(line)[0] for line in self.lines())
+        return pg.Rect(self.x, 0, width, 64 + self.font.height)
+
+
+class ProfilerOverlay(Renderable, Bounded):
+    """Span timings of the recent frames, shown while the profiler is enabled."""
+
+    RENDER_LAYER = RenderLayer.HUD
+    # frames between refreshes, so the numbers stay readable
+    REFRESH_FRAMES = 30
+    # fixed panel size, so the area to redraw never depends on the text
+    COLUMNS = 44
+    ROWS = 16
+
+    def __init__(self, profiler: Profiler, right: int) -> None:
+        self.profiler = profiler
+        self.font = GlyphAtlas("Cascadia Code", 16, (0, 0, 0))
+        width = self.font.size("0" * self.COLUMNS)[0]
+        self.area = pg.Rect(right - width, 0, width, self.ROWS * self.font.height)
+        self.cached: list[str] = []
+        self.frames = 0
+
+    def lines(self) -> list[str]:
+        if self.frames % self.REFRESH_FRAMES == 0:
+            summary = sorted(
+                self.profiler.summary().items(), key=lambda item: -item[1].mean
+            )
+            self.cached = [
+                f"{name[:16]:<16} {s.p50:6.2f} {s.p95:6.2f} {s.p99:6.2f}"
+                for name, s in summary[: self.ROWS - 1]
+            ]
+            self.cached.insert(0, f"{'ms':<16} {'p50':>6} {'p95':>6} {'p99':>6}")
+        self.frames += 1
+        return self.cached
+
+    def render(self, surface: pg.Surface, camera: Camera) -> None:
+        if not self.profiler.enabled:
+            return
+        for i, line in enumerate(self.lines()):
+            self.font.render(
+                surface, line, (self.area.x, self.area.y + i * self.font.height)
+            )
+
+    def get_bounds(self) -> pg.Rect:
+        return self.area if self.profiler.enabled else pg.Rect(0, 0, 0, 0)
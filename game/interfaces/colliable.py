@@ -1,8 +1,8 @@
 from abc import abstractmethod
 from collections.abc import Callable
-from typing import NamedTuple, Protocol, runtime_checkable
+from typing import ClassVar, NamedTuple, Protocol, TypeVar, runtime_checkable
 
-from game.utils import Rect, Vector2D
+from game.utils import PROFILER, DenseSet, Rect, SpatialHash, Vector2D, sweep
 
 from .updatable import Updatable
 
@@ -10,13 +10,38 @@ from .updatable import Updatable
 class Collision(NamedTuple):
     a: "Colliable"
     b: "Colliable"
+    # fraction of the step at which they first touched, 0 if they already did
+    toi: float = 0.0
 
 
 CollisionCallback = Callable[[Collision], None]
+# handles every collision a callback got in a step, given the step's dt
+BatchCallback = Callable[[list[Collision], float], None]
+
+F = TypeVar("F", bound=Callable)
+
+
+def batched(batch: BatchCallback) -> Callable[[F], F]:
+    """Mark a callback that ``batch`` can stand in for.
+
+    Consecutive collisions in a step that would go to it are handed to
+    ``batch`` at once instead. A run ends before any other callback, and
+    before another collision of a body the run moves, so the result is the
+    same as calling it for each collision in order.
+    """
+
+    def mark(callback: F) -> F:
+        callback.batch = batch
+        return callback
+
+    return mark
 
 
 @runtime_checkable
 class Colliable(Protocol):
+    # static colliders never move, so they are bucketed once
+    STATIC: ClassVar[bool] = False
+
     @abstractmethod
     def get_rect(self) -> Rect:
         ...
@@ -33,18 +58,36 @@ class Colliable(Protocol):
     def get_callbacks(self) -> list[tuple[CollisionCallback, type["Colliable"]]]:
         ...
 
+    def get_previous_rect(self) -> Rect:
+        """The rect at the start of the step, to sweep from."""
+        return self.get_rect()
+
+    def rewind(self, toi: float) -> None:
+        """Move back to where it was ``toi`` of the way through the step."""
+
 
 class CollisionHandler(Updatable):
-    def __init__(self) -> None:
+    def __init__(self, cell_size: int = 48) -> None:
         self.callbacks: list[CollisionCallback] = []
-        self.collidables: list[Colliable] = []
-        self.jumptable: list[tuple[Colliable, type[Colliable], CollisionCallback]] = []
+        self.collidables = DenseSet[Colliable]()
+        # id(owner) -> target type -> callbacks, in registration order
+        self.jumptable: dict[
+            int, dict[type[Colliable], dict[CollisionCallback, None]]
+        ] = {}
+        # id(owner) -> concrete class -> callbacks resolved along its MRO
+        self.dispatch: dict[int, dict[type, tuple[CollisionCallback, ...]]] = {}
+        self.grid = SpatialHash[Colliable](cell_size)
+        # id(colliable) -> the area it swept in the last step, reused
+        self.swept: dict[int, Rect] = {}
 
     def add(self, colliable: Colliable):
-        self.collidables.append(colliable)
+        self.grid.insert(colliable, colliable.get_rect())
+        self.collidables.add(colliable)
 
     def remove(self, colliable: Colliable):
         self.collidables.remove(colliable)
+        self.grid.remove(colliable)
+        self.swept.pop(id(colliable), None)
 
     def register(
         self,
@@ -52,7 +95,8 @@ class CollisionHandler(Updatable):
         a: Colliable,
         b: type[Colliable],
     ):
-        self.jumptable.append((a, b, callback))
+        self.jumptable.setdefault(id(a), {}).setdefault(b, {})[callback] = None
+        self.dispatch.pop(id(a), None)
 
     def unregister(
         self,
@@ -60,18 +104,127 @@ class CollisionHandler(Updatable):
         a: Colliable,
         b: type[Colliable],
     ):
-        self.jumptable.remove((a, b, callback))
+        table = self.jumptable.get(id(a), {})
+        callbacks = table.get(b, {})
+        if callback not in callbacks:
+            raise ValueError(f"{callback} is not registered for {a} and {b}")
+        del callbacks[callback]
+        if not callbacks:
+            del table[b]
+            if not table:
+                del self.jumptable[id(a)]
+        self.dispatch.pop(id(a), None)
+
+    def unregister_all(self, a: Colliable):
+        """Drop every callback ``a`` has registered."""
+        self.jumptable.pop(id(a), None)
+        self.dispatch.pop(id(a), None)
+
+    def resolve(self, a: Colliable, cls: type) -> tuple[CollisionCallback, ...]:
+        """Callbacks ``a`` has registered for instances of ``cls``."""
+        cache = self.dispatch.get(id(a))
+        if cache is None:
+            cache = self.dispatch[id(a)] = {}
+        callbacks = cache.get(cls)
+        if callbacks is None:
+            table = self.jumptable.get(id(a), {})
+            callbacks = cache[cls] = tuple(
+                callback for base in cls.__mro__ for callback in table.get(base, ())
+            )
+        return callbacks
 
     def update(self, dt):
-        collisions = []
-        for a in self.collidables:
-            for b in self.collidables:
-                if a is not b and a.collide(b):
-                    collisions.append(Collision(a, b))
-
-        for collision in collisions:
-            for a, b, callback in self.jumptable:
-                if a == collision.a and isinstance(collision.b, b):
-                    callback(collision)
+        with PROFILER.span("collisions.grid", detail=True):
+            dynamic = [a for a in self.collidables if not a.STATIC]
+            starts = [a.get_previous_rect() for a in dynamic]
+            # bucketed by the area swept this step, so that bodies passing
+            # through each other between ticks are still paired
+            swept = []
+            for a, start in zip(dynamic, starts):
+                area = self.swept.get(id(a))
+                if area is None:
+                    area = self.swept[id(a)] = Rect(0, 0, 0, 0)
+                area.set(start.x, start.y, start.w, start.h).union_ip(a.get_rect())
+                self.grid.move(a, area)
+                swept.append(area)
+
+        # The resolved callbacks double as the filter matrix: a side nobody
+        # listens to is rejected before collide() and never allocates a
+        # Collision. Static bodies never query, so static-vs-static pairs
+        # are never considered at all.
+        collisions: list[tuple[Collision, tuple[CollisionCallback, ...], bool]] = []
+        with PROFILER.span("collisions.pairs", detail=True):
+            for a, start, area in zip(dynamic, starts, swept):
+                for b in self.grid.query(a):
+                    if b.STATIC and not area.collide(b.get_rect()):
+                        continue
+                    callbacks = self.resolve(a, type(b))
+                    if callbacks:
+                        overlapping = a.collide(b)
+                        toi = self.__impact(a, start, b, overlapping)
+                        if toi is not None:
+                            collision = Collision(a, b, toi)
+                            collisions.append((collision, callbacks, not overlapping))
+                    if not b.STATIC:
+                        continue
+                    callbacks = self.resolve(b, type(a))
+                    if callbacks:
+                        overlapping = b.collide(a)
+                        toi = self.__impact(a, start, b, overlapping)
+                        if toi is not None:
+                            collision = Collision(b, a, toi)
+                            collisions.append((collision, callbacks, not overlapping))
+
+        with PROFILER.span("collisions.callbacks", detail=True):
+            # earliest contacts first; a body stopped at one never reaches
+            # the contacts after it, unless it still overlaps them
+            collisions.sort(key=lambda item: item[0].toi)
+            stopped: set[int] = set()
+            # a run of collisions for one batch callback, handed over once
+            # the stream moves on to another callback or to a body the run
+            # moves, so it still takes effect at its place in the stream
+            run: list[Collision] = []
+            run_batch: BatchCallback | None = None
+            run_bodies: set[int] = set()
+            for collision, callbacks, passed in collisions:
+                a, b = collision.a, collision.b
+                if run and (id(a) in run_bodies or id(b) in run_bodies):
+                    run_batch(run, dt)
+                    run, run_bodies = [], set()
+                if id(a) in stopped:
+                    if not a.collide(b):
+                        continue
+                elif passed and b.STATIC:
+                    a.rewind(collision.toi)
+                    stopped.add(id(a))
+                for callback in callbacks:
+                    batch = getattr(callback, "batch", None)
+                    if run and batch is not run_batch:
+                        run_batch(run, dt)
+                        run, run_bodies = [], set()
+                    if batch is None:
+                        callback(collision)
+                        continue
+                    run_batch = batch
+                    run.append(collision)
+                    run_bodies.add(id(a))
+                    if not b.STATIC:
+                        run_bodies.add(id(b))
+            if run:
+                run_batch(run, dt)
 
         self.callbacks.clear()
+
+    @staticmethod
+    def __impact(
+        a: Colliable, start: Rect, b: Colliable, overlapping: bool
+    ) -> float | None:
+        """When ``a``, swept from ``start``, first touched ``b`` this step.
+
+        Pairs that touched during the step without overlapping after it
+        passed through each other between ticks.
+        """
+        toi = sweep(start, a.get_rect(), b.get_previous_rect(), b.get_rect())
+        if overlapping:
+            return toi or 0.0
+        return toi
@@ -1,9 +1,13 @@
 from abc import ABC
 
+import pygame as pg
+
 from .colliable import Colliable
-from .renderable import Renderable
+from .renderable import Bounded, Renderable
 from .updatable import Updatable
 
 
-class PlayInstance(ABC, Colliable, Renderable, Updatable):
-    pass
+class PlayInstance(ABC, Colliable, Renderable, Updatable, Bounded):
+    def get_bounds(self) -> pg.Rect:
+        # a pixel of slack for float positions truncated by blit
+        return self.get_rect().to_pygame().inflate(2, 2)
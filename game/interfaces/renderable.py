@@ -1,26 +1,282 @@
 from abc import abstractmethod
-from typing import Protocol, runtime_checkable
+from collections.abc import Iterator
+from enum import IntEnum
+from typing import ClassVar, Protocol, runtime_checkable
 
 import pygame as pg
 
+from game.utils import PROFILER, Camera, DenseSet, SpatialHash
+
+
+class RenderLayer(IntEnum):
+    """Z-order of renderables, back to front."""
+
+    # static geometry, composited once into a cached surface
+    BACKGROUND = 0
+    WORLD = 1
+    EFFECTS = 2
+    HUD = 3
+
 
 @runtime_checkable
 class Renderable(Protocol):
+    RENDER_LAYER: ClassVar[RenderLayer] = RenderLayer.WORLD
+
+    @abstractmethod
+    def render(self, surface: pg.Surface, camera: Camera) -> None:
+        """Draw onto ``surface`` as seen through ``camera``.
+
+        Renderables in ``RenderHandler.SCREEN_LAYERS`` ignore the camera.
+        """
+
+
+@runtime_checkable
+class Bounded(Protocol):
+    @abstractmethod
+    def get_bounds(self) -> pg.Rect | None:
+        """Area the next render will touch, or None if unknown.
+
+        In world coordinates, except for renderables drawn in screen ones.
+        """
+
+
+@runtime_checkable
+class Interpolated(Protocol):
     @abstractmethod
-    def render(self, surface: pg.Surface) -> None:
-        ...
+    def interpolate(self, alpha: float) -> None:
+        """Render ``alpha`` of the way from the previous tick to the current one."""
 
 
 class RenderHandler(Renderable):
-    def __init__(self):
-        self.renderables: list[Renderable] = []
+    # beyond this fraction of the screen, a full flip is cheaper
+    FULL_REDRAW_RATIO = 0.5
+    BAKED_LAYERS = (RenderLayer.BACKGROUND,)
+    LIVE_LAYERS = (RenderLayer.WORLD, RenderLayer.EFFECTS, RenderLayer.HUD)
+    # drawn in screen coordinates, whatever part of the world is in view
+    SCREEN_LAYERS = (RenderLayer.HUD,)
+    # side of the cells static renderables are indexed in, in world pixels
+    CELL_SIZE = 128
+    SPAN_NAMES = {layer: f"render.{layer.name.lower()}" for layer in RenderLayer}
+
+    def __init__(
+        self,
+        dirty: bool = False,
+        background: tuple[int, int, int] = (255, 255, 255),
+        camera: Camera | None = None,
+    ):
+        self.layers: dict[RenderLayer, DenseSet[Renderable]] = {
+            layer: DenseSet() for layer in RenderLayer
+        }
+        self.interpolated = DenseSet[Interpolated]()
+        # class -> whether it is Interpolated; Protocol checks are slow
+        self.interpolating: dict[type, bool] = {}
+        # sized to the surface on the first render if not given
+        self.camera = camera
+        # baked and STATIC renderables by the area they draw, so finding those
+        # in view costs what is in view rather than the size of the world
+        self.index = SpatialHash[Renderable](self.CELL_SIZE)
+        # id(renderable) -> world area it draws, for indexed renderables and
+        # live ones as of the last render; None if unknown
+        self.areas: dict[int, pg.Rect | None] = {}
+        # baked renderables of unknown area, drawn wherever the camera is
+        self.unbounded: dict[int, Renderable] = {}
+        # renderables in view, in drawing order
+        self.visible: dict[RenderLayer, list[Renderable]] = {
+            layer: [] for layer in RenderLayer
+        }
+        self.dirty = dirty
+        self.background_color = background
+        # baked layers composited over the background colour
+        self.background: pg.Surface | None = None
+        # viewport position the background was baked at
+        self.baked_at: tuple[int, int] | None = None
+        # id(renderable) -> screen area it covered when last drawn
+        self.bounds: dict[int, pg.Rect] = {}
+        # areas to restore next frame, e.g. where removed renderables were
+        self.invalid: list[pg.Rect] = []
+        # areas to present this frame, or None for a full flip
+        self.updated: list[pg.Rect] | None = None
 
     def add(self, renderable: Renderable):
-        self.renderables.append(renderable)
+        self.layers[renderable.RENDER_LAYER].add(renderable)
+        interpolating = self.interpolating.get(type(renderable))
+        if interpolating is None:
+            interpolating = self.interpolating[type(renderable)] = isinstance(
+                renderable, Interpolated
+            )
+        if interpolating:
+            self.interpolated.add(renderable)
+        layer = renderable.RENDER_LAYER
+        if layer in self.BAKED_LAYERS or (
+            layer not in self.SCREEN_LAYERS and getattr(renderable, "STATIC", False)
+        ):
+            self.__index(renderable)
+        if layer in self.BAKED_LAYERS:
+            self.rebake()
 
     def remove(self, renderable: Renderable):
-        self.renderables.remove(renderable)
+        self.layers[renderable.RENDER_LAYER].remove(renderable)
+        if renderable in self.interpolated:
+            self.interpolated.remove(renderable)
+        if renderable in self.index:
+            self.index.remove(renderable)
+        self.areas.pop(id(renderable), None)
+        self.unbounded.pop(id(renderable), None)
+        if renderable.RENDER_LAYER in self.BAKED_LAYERS:
+            self.rebake()
+        bounds = self.bounds.pop(id(renderable), None)
+        if bounds is not None:
+            self.invalid.append(bounds)
+
+    def rebake(self):
+        """Recomposite the baked layers before the next frame."""
+        self.background = None
+
+    def render(self, surface: pg.Surface, alpha: float = 1.0):
+        if self.camera is None:
+            self.camera = Camera(surface.get_size())
+        for renderable in self.interpolated:
+            renderable.interpolate(alpha)
+        with PROFILER.span("render.cull", detail=True):
+            self.__cull()
+        if (
+            self.background is None
+            or self.background.get_size() != surface.get_size()
+            or self.baked_at != self.camera.offset
+        ):
+            self.__bake(surface)
+            self.__redraw(surface)
+            return
+        if not self.dirty:
+            self.__redraw(surface)
+            return
+
+        dirty, self.invalid = self.invalid, []
+        current: dict[int, pg.Rect] = {}
+        for renderable in self.__live():
+            bounds = self.__bounds(renderable)
+            if bounds is None:
+                self.__redraw(surface)
+                return
+            current[id(renderable)] = bounds
+            previous = self.bounds.get(id(renderable))
+            if previous is not None and previous.colliderect(bounds):
+                dirty.append(previous.union(bounds))
+            else:
+                dirty.append(bounds)
+                if previous is not None:
+                    dirty.append(previous)
+        # drawn last frame, but out of view now
+        dirty.extend(
+            previous for key, previous in self.bounds.items() if key not in current
+        )
+
+        screen = surface.get_rect()
+        dirty = [rect.clip(screen) for rect in dirty]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+        area = sum(rect.width * rect.height for rect in dirty)
+        if area > screen.width * screen.height * self.FULL_REDRAW_RATIO:
+            self.__redraw(surface)
+            return
+
+        with PROFILER.span("render.restore", detail=True):
+            for rect in dirty:
+                surface.blit(self.background, rect, rect)
+        self.__draw_live(surface)
+        self.bounds = current
+        self.updated = dirty
+
+    def present(self):
+        if self.dirty and self.updated is not None:
+            pg.display.update(self.updated)
+        else:
+            pg.display.flip()
+
+    def __index(self, renderable: Renderable):
+        area = self.__area(renderable)
+        if area is None:
+            self.unbounded[id(renderable)] = renderable
+            return
+        self.areas[id(renderable)] = area
+        self.index.insert(renderable, area)
+
+    def __cull(self):
+        """Collect the live renderables in view, each layer in drawing order."""
+        viewport = self.camera.viewport
+        areas = self.areas
+        for layer in self.LIVE_LAYERS:
+            if layer in self.SCREEN_LAYERS:
+                self.visible[layer] = self.layers[layer].items
+                continue
+            visible = self.visible[layer] = []
+            for renderable in self.layers[layer]:
+                key = id(renderable)
+                if renderable in self.index:
+                    area = areas[key]
+                else:
+                    area = areas[key] = self.__area(renderable)
+                if area is None or viewport.colliderect(area):
+                    visible.append(renderable)
+
+    def __cull_baked(self):
+        viewport = self.camera.viewport
+        for layer in self.BAKED_LAYERS:
+            members = self.layers[layer]
+            visible = [
+                renderable
+                for renderable in self.index.search(viewport)
+                if renderable.RENDER_LAYER == layer
+                and viewport.colliderect(self.areas[id(renderable)])
+            ]
+            visible.extend(
+                renderable
+                for renderable in self.unbounded.values()
+                if renderable.RENDER_LAYER == layer
+            )
+            visible.sort(key=lambda renderable: members.positions[id(renderable)])
+            self.visible[layer] = visible
+
+    def __live(self) -> Iterator[Renderable]:
+        for layer in self.LIVE_LAYERS:
+            yield from self.visible[layer]
+
+    def __draw_live(self, surface: pg.Surface):
+        for layer in self.LIVE_LAYERS:
+            with PROFILER.span(self.SPAN_NAMES[layer], detail=True):
+                for renderable in self.visible[layer]:
+                    renderable.render(surface, self.camera)
+
+    def __redraw(self, surface: pg.Surface):
+        with PROFILER.span("render.restore", detail=True):
+            surface.blit(self.background, (0, 0))
+        self.__draw_live(surface)
+        self.updated = None
+        if not self.dirty:
+            return
+        self.invalid.clear()
+        self.bounds = {}
+        for renderable in self.__live():
+            bounds = self.__bounds(renderable)
+            if bounds is not None:
+                self.bounds[id(renderable)] = bounds
+
+    def __bake(self, surface: pg.Surface):
+        self.__cull_baked()
+        self.background = pg.Surface(surface.get_size(), 0, surface)
+        self.background.fill(self.background_color)
+        for layer in self.BAKED_LAYERS:
+            for renderable in self.visible[layer]:
+                renderable.render(self.background, self.camera)
+        self.baked_at = self.camera.offset
+
+    @staticmethod
+    def __area(renderable: Renderable) -> pg.Rect | None:
+        get_bounds = getattr(renderable, "get_bounds", None)
+        return get_bounds() if get_bounds else None
 
-    def render(self, surface: pg.Surface):
-        for renderable in self.renderables:
-            renderable.render(surface)
+    def __bounds(self, renderable: Renderable) -> pg.Rect | None:
+        """Screen area of the renderable's next render, or None if unknown."""
+        if renderable.RENDER_LAYER in self.SCREEN_LAYERS:
+            return self.__area(renderable)
+        area = self.areas.get(id(renderable))
+        return self.camera.to_screen(area) if area is not None else None
@@ -1,5 +1,16 @@
 from abc import abstractmethod
-from typing import Protocol, runtime_checkable
+from collections.abc import Callable
+from typing import Protocol, TypeVar, runtime_checkable
+
+from game.utils import DenseSet
+
+F = TypeVar("F", bound=Callable)
+
+
+def noop_update(update: F) -> F:
+    """Mark an ``update`` that does nothing, so it is never scheduled."""
+    update.noop = True
+    return update
 
 
 @runtime_checkable
@@ -11,10 +22,10 @@ class Updatable(Protocol):
 
 class UpdateHandler(Updatable):
     def __init__(self) -> None:
-        self.updatables: list[Updatable] = []
+        self.updatables = DenseSet[Updatable]()
 
     def add(self, updatable: Updatable):
-        self.updatables.append(updatable)
+        self.updatables.add(updatable)
 
     def remove(self, updatable: Updatable):
         self.updatables.remove(updatable)
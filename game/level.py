@@ -0,0 +1,220 @@
+"""Levels authored as tile grids, baked into merged walls.
+
+A level file is a few ``key value`` settings followed by the grid, one
+character per tile: ``#`` is a wall, ``=`` a sticky wall and anything else
+empty, as is a blank line within the grid. Lines starting with ``;`` are
+comments.
+
+    tile 16         tile size in pixels
+    origin 0 -16    where the top left tile goes on the screen
+    margin 1024     how far walls touching an edge of the grid extend past it
+
+Runs of tiles of the same kind are merged greedily into as few rectangles as
+possible, and the walls are textured into one image of the grid. Both are
+cached next to the level, as a JSON manifest and raw pixels, and rebuilt when
+the level file or the wall texture changes.
+
+    python -m game.level levels/default.txt
+"""
+import json
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+import pygame as pg
+
+from .utils import DATA_DIR, Asset, make_rect
+from .utils.bundle import PIXEL_FORMAT, stamp
+from .wall import Wall
+
+WALL = "#"
+STICKY = "="
+SOLID = (WALL, STICKY)
+COMMENT = ";"
+# the walls are painted with it, so the cache is stale once it changes
+TEXTURE = DATA_DIR / Wall.TEXTURE.name
+
+
+class Block(NamedTuple):
+    rect: pg.Rect
+    sticky: bool
+
+
+class Level(NamedTuple):
+    blocks: list[Block]
+    # screen area covered by the grid, and the walls drawn over it
+    area: pg.Rect
+    image: pg.Surface
+
+    def walls(self) -> list[Wall]:
+        result = []
+        for rect, sticky in self.blocks:
+            visible = rect.clip(self.area)
+            surface = self.image.subsurface(visible.move(-self.area.x, -self.area.y))
+            result.append(Wall(rect, sticky, surface, visible.topleft))
+        return result
+
+
+def parse(text: str) -> tuple[dict[str, list[int]], list[str]]:
+    """Settings and grid rows of a level file."""
+    settings = {"tile": [48], "origin": [0, 0], "margin": [0]}
+    rows = []
+    for line in text.splitlines():
+        if line.startswith(COMMENT):
+            continue
+        words = line.split()
+        # blank lines only separate settings; within the grid they are rows
+        if not rows and not words:
+            continue
+        if not rows and words[0] in settings:
+            settings[words[0]] = [int(value) for value in words[1:]]
+        else:
+            rows.append(line.rstrip())
+    while rows and not rows[-1]:
+        rows.pop()
+    return settings, rows
+
+
+def merge(rows: list[str]) -> list[tuple[int, int, int, int, str]]:
+    """Greedy ``(column, row, width, height, kind)`` cover of the solid tiles.
+
+    Each block takes the longest run from its first tile, then grows down
+    while the whole run below is the same kind and not yet covered.
+    """
+    width = max(map(len, rows), default=0)
+    grid = [row.ljust(width) for row in rows]
+    covered = [[False] * width for _ in grid]
+    blocks = []
+    for y, row in enumerate(grid):
+        x = 0
+        while x < width:
+            kind = row[x]
+            if kind not in SOLID or covered[y][x]:
+                x += 1
+                continue
+            end = x
+            while end < width and row[end] == kind and not covered[y][end]:
+                end += 1
+            bottom = y + 1
+            while bottom < len(grid) and all(
+                grid[bottom][i] == kind and not covered[bottom][i]
+                for i in range(x, end)
+            ):
+                bottom += 1
+            for i in range(y, bottom):
+                covered[i][x:end] = [True] * (end - x)
+            blocks.append((x, y, end - x, bottom - y, kind))
+            x = end
+    return blocks
+
+
+def bake(path: Path) -> dict:
+    """Merge the walls of the level at ``path``; returns its manifest."""
+    settings, rows = parse(path.read_text())
+    (tile,), (left, top) = settings["tile"], settings["origin"]
+    (margin,) = settings["margin"]
+    columns = max(map(len, rows), default=0)
+    right, bottom = left + columns * tile, top + len(rows) * tile
+
+    blocks = []
+    for x, y, w, h, kind in merge(rows):
+        rect = make_rect(left + x * tile, top + y * tile, w * tile, h * tile)
+        # the world past the grid is as solid as its edge
+        if rect.right == right:
+            rect.width += margin
+        if rect.left == left:
+            rect.width += margin
+            rect.x -= margin
+        if rect.bottom == bottom:
+            rect.height += margin
+        if rect.top == top:
+            rect.height += margin
+            rect.y -= margin
+        blocks.append({"rect": list(rect), "sticky": kind == STICKY})
+    return {
+        "source": stamp(path),
+        "texture": stamp(TEXTURE),
+        "format": PIXEL_FORMAT,
+        "area": [left, top, right - left, bottom - top],
+        "blocks": blocks,
+    }
+
+
+def paint(area: pg.Rect, blocks: list[Block]) -> pg.Surface:
+    """The walls in ``blocks`` as they look on the screen within ``area``."""
+    image = pg.Surface(area.size, pg.SRCALPHA)
+    texture = Wall.TEXTURE.get()
+    width, height = texture.get_size()
+    for rect, _ in blocks:
+        visible = rect.clip(area)
+        if not visible:
+            continue
+        target = image.subsurface(visible.move(-area.x, -area.y))
+        target.fill((0, 0, 0))
+        # tiles start from the wall's corner, wherever that is
+        start_x = rect.x + (visible.x - rect.x) // width * width
+        start_y = rect.y + (visible.y - rect.y) // height * height
+        for x in range(start_x, visible.right, width):
+            for y in range(start_y, visible.bottom, height):
+                target.blit(texture, (x - visible.x, y - visible.y))
+    return image
+
+
+def read_blocks(manifest: dict) -> list[Block]:
+    return [Block(pg.Rect(b["rect"]), b["sticky"]) for b in manifest["blocks"]]
+
+
+def build(path: Path) -> Path:
+    """Bake the level at ``path`` and cache it; returns the manifest path."""
+    manifest = bake(path)
+    image = paint(pg.Rect(manifest["area"]), read_blocks(manifest))
+    path.with_suffix(".bin").write_bytes(pg.image.tobytes(image, PIXEL_FORMAT))
+    path.with_suffix(".json").write_text(json.dumps(manifest, indent=2))
+    return path.with_suffix(".json")
+
+
+def read_level(path: str | Path) -> tuple[dict, bytes] | None:
+    """The cached manifest and pixels of the level at ``path`` under ``data/``.
+
+    None if the cache is missing or stale. Never touches the display, so it
+    may run off the main thread.
+    """
+    path = (DATA_DIR / path).resolve()
+    manifest, pixels = path.with_suffix(".json"), path.with_suffix(".bin")
+    if not manifest.exists() or not pixels.exists():
+        return None
+    info = json.loads(manifest.read_text())
+    if info["source"] != stamp(path) or info.get("texture") != stamp(TEXTURE):
+        return None
+    return info, pixels.read_bytes()
+
+
+def load_level(
+    path: str | Path, cached: tuple[dict, bytes] | None = None
+) -> Level:
+    """The level at ``path`` under ``data/``, baking it first if it changed.
+
+    ``cached`` is what ``read_level`` returned, if it was already called.
+    """
+    if cached is None:
+        cached = read_level(path)
+    if cached is None:
+        build((DATA_DIR / path).resolve())
+        cached = read_level(path)
+    info, pixels = cached
+    area = pg.Rect(info["area"])
+    image = pg.image.frombytes(pixels, area.size, info["format"])
+    if pg.display.get_surface() is not None:
+        image = image.convert_alpha()
+    return Level(read_blocks(info), area, image)
+
+
+def lazy_level(path: str | Path) -> Asset[Level]:
+    return Asset(
+        str(path), lambda: read_level(path), lambda cached: load_level(path, cached)
+    )
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:]:
+        print(f"wrote {build((DATA_DIR / name).resolve())}")
@@ -1,22 +1,43 @@
+import atexit
+import os
+import random
+
 import pygame as pg
 
 from .constants import ICON, SIZE, TITLE
 from .endscreen import EndScreen
 from .game import Game
 from .menu import MainMenu
+from .startup import STARTUP
+
+# set to a path to record the session played to it, for ``game.replay``
+RECORD_ENV = "GAME_RECORD"
 
 
 def main():
+    STARTUP.mark("import")
     pg.init()
 
     surface = pg.display.set_mode(SIZE, pg.SRCALPHA)
     pg.display.set_caption(TITLE)
-    pg.display.set_icon(ICON)
+    pg.display.set_icon(ICON.get())
+    STARTUP.mark("display")
 
     def end_game(title, score, message):
         EndScreen(surface, title, score, message).loop()
 
     def play_game():
-        Game(surface, end_game).loop()
+        path = os.environ.get(RECORD_ENV)
+        if not path:
+            Game(surface, end_game).loop()
+            return
+        # imported here so that ``python -m game.replay`` runs it only once
+        from .replay import Recorder
+
+        recorder = Recorder(random.randrange(2**32))
+        game = Game(surface, end_game, recorder.recording.seed, recorder)
+        # the game only ends by exiting the process
+        atexit.register(recorder.save, path, game)
+        game.loop()
 
-    MainMenu(surface, play_game).loop()
+    MainMenu(surface, play_game, Game.ASSETS).loop()
@@ -1,10 +1,13 @@
+from collections.abc import Iterable
+
 import pygame as pg
 
-from .utils import HAlign, VAlign, text
+from .startup import STARTUP
+from .utils import Asset, HAlign, VAlign, prefetch, text
 
 
 class MainMenu:
-    def __init__(self, surface, play_fn):
+    def __init__(self, surface, play_fn, assets: Iterable[Asset] = ()):
         self.surface = surface
         self.screen_width, self.screen_height = self.surface.get_size()
         self.cx, self.cy = self.screen_width // 2, self.screen_height // 2
@@ -25,6 +28,9 @@ class MainMenu:
         # Load font
         self.font = pg.font.Font(None, 50)
 
+        # Load gameplay assets while the player is on the menu
+        self.prefetch = prefetch(assets)
+
     def loop(self):
         while True:
             # Handle events
@@ -69,3 +75,5 @@ class MainMenu:
 
             # Update the display
             pg.display.update()
+            STARTUP.mark("first frame")
+            STARTUP.report()
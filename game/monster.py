@@ -1,3 +1,5 @@
+import random
+
 from .interfaces import *
 from .physics import *
 from .utils import *
@@ -5,15 +7,32 @@ from .wall import Wall
 
 
 class Monster(PlayInstance):
-    def __init__(self):
-        self.sprite = load_im("monster.png")
+    SPRITE = lazy_im("monster.png")
+
+    def __init__(self, rng: random.Random | None = None):
+        self.sprite = Monster.SPRITE.get()
         self.rb = RigidBodyRect(Rect.from_pygame(self.sprite.get_rect()), mass=1)
-        self.rb.velocity = Vector2D(random.randint(-100, 100), random.randint(-10, 10))
+        self.reset(rng)
+
+    def reset(self, rng: random.Random | None = None) -> None:
+        rng = rng or random
+        self.rb.velocity = Vector2D(rng.randint(-100, 100), rng.randint(-10, 10))
+        self.rb.acceleration = Vector2D(0, 0)
+        self.rb.gravity = True
         self.dt = 0
 
+    def park(self) -> None:
+        self.rb.park()
+
     def get_rect(self) -> Rect:
         return self.rb.get_rect()
 
+    def get_previous_rect(self) -> Rect:
+        return self.rb.get_previous_rect()
+
+    def rewind(self, toi: float) -> None:
+        self.rb.rewind(toi)
+
     def get_velocity(self) -> "Vector2D":
         return self.rb.get_velocity()
 
@@ -23,13 +42,25 @@ class Monster(PlayInstance):
     def get_callbacks(self) -> list[tuple[CollisionCallback, type["Colliable"]]]:
         return [(self.wall_collide, Wall)]
 
-    def render(self, surface: pg.Surface) -> None:
-        surface.blit(self.sprite, self.get_rect().to_pygame())
-        self.rb.render(surface)
+    def render(self, surface: pg.Surface, camera: Camera) -> None:
+        surface.blit(self.sprite, camera.to_screen(self.get_rect()))
+        self.rb.render(surface, camera)
 
     def update(self, dt: float) -> None:
-        self.rb.update(dt)
         self.dt = dt
 
+    @staticmethod
+    def wall_collide_all(collisions: list[Collision], dt: float) -> None:
+        if len(collisions) < BATCH_MIN:
+            for collision in collisions:
+                handle_collision(collision, collision.a.rb, dt)
+            return
+        bodies = [collision.a.rb for collision in collisions]
+        handle_collisions(collisions, bodies, dt)
+
+    @batched(wall_collide_all)
     def wall_collide(self, collision: Collision) -> None:
         handle_collision(collision, self.rb, self.dt)
+
+
+Monster.POOL = Pool(Monster, capacity=64)
@@ -1,57 +1,160 @@
+import random
 from abc import ABC
 
+import numpy as np
 import pygame as pg
 
 from .command import RemoveInstanceCMD, issue_command
-from .interfaces import Renderable, Updatable
-from .utils import Number, Vector2D
+from .interfaces import Bounded, Interpolated, Renderable, RenderLayer, Updatable
+from .utils import Camera, Pool, Vector2D
+
+STAMP_STEPS = 32
+STAMPS: dict[tuple[tuple[int, int, int], int], list[pg.Surface]] = {}
+
+
+def fading_stamps(color: tuple[int, int, int], size: int) -> list[pg.Surface]:
+    """Circles of ``color`` shrinking and fading from ``size`` to nothing."""
+    key = (color, size)
+    if key not in STAMPS:
+        stamps = []
+        for step in range(STAMP_STEPS):
+            t = step / STAMP_STEPS
+            stamp = pg.Surface((size * 2 + 1, size * 2 + 1), pg.SRCALPHA)
+            pg.draw.circle(
+                stamp, (*color, round(255 - t * 255)), (size, size), size - t * size
+            )
+            stamps.append(stamp)
+        STAMPS[key] = stamps
+    return STAMPS[key]
 
 
 class Particle(Renderable, Updatable, ABC):
     """Metaclass for all particles"""
 
+    RENDER_LAYER = RenderLayer.EFFECTS
+
+
+class ParticleEmitter(Particle, Bounded, Interpolated):
+    """Array-backed pool of fading particles sharing one colour and size."""
 
-class FadingParticle(Particle):
     def __init__(
         self,
-        pos: Vector2D,
-        vel: Vector2D,
-        acc: Vector2D,
         color: tuple[int, int, int],
         size: int,
-        lifetime: int,
+        capacity: int = 128,
         auto_remove: bool = True,
     ) -> None:
-        self.pos = pos
-        self.color = color
-        self.size = size
-        self.vel = vel
-        self.acc = acc
+        self.position = np.zeros((capacity, 2))
+        self.previous = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.acceleration = np.zeros((capacity, 2))
 
         # specified in ticks
-        self.age = 0
-        self.lifetime = lifetime
+        self.age = np.zeros(capacity, dtype=np.int64)
+        self.lifetime = np.ones(capacity, dtype=np.int64)
         self.auto_remove = auto_remove
+        ParticleEmitter.reset(self, color, size)
 
-    def render(self, surface: pg.Surface) -> None:
-        alpha = 255 - (self.age / self.lifetime) * 255
-        size = self.size - (self.age / self.lifetime) * self.size
-        pg.draw.circle(
-            surface,
-            self.color + (alpha,),
-            (int(self.pos.x), int(self.pos.y)),
-            size,
-        )
+    def reset(self, color: tuple[int, int, int], size: int) -> None:
+        """Drop every particle and draw new ones in ``color`` and ``size``."""
+        self.color = color
+        self.size = size
+        self.stamps = fading_stamps(color, size)
+        self.count = 0
+        self.alpha = 1.0
+
+    def park(self) -> None:
+        """Drop every particle."""
+        self.count = 0
+
+    def emit(
+        self,
+        pos: Vector2D,
+        vel: np.ndarray,
+        acc: np.ndarray,
+        lifetime: int,
+    ) -> None:
+        """Spawn ``len(vel)`` particles at ``pos``."""
+        n = len(vel)
+        start, end = self.count, self.count + n
+        if end > len(self.age):
+            self.__grow(end)
+        self.position[start:end] = self.previous[start:end] = pos.x, pos.y
+        self.velocity[start:end] = vel
+        self.acceleration[start:end] = acc
+        self.age[start:end] = 0
+        self.lifetime[start:end] = lifetime
+        self.count = end
 
     def update(self, dt: float) -> None:
-        self.vel += self.acc * dt
-        self.pos += self.vel * dt
-        self.age += 1
-        if self.age >= self.lifetime and self.auto_remove:
+        n = self.count
+        velocity = self.velocity[:n]
+        velocity += self.acceleration[:n] * dt
+        self.previous[:n] = self.position[:n]
+        self.position[:n] += velocity * dt
+        self.age[:n] += 1
+
+        alive = self.age[:n] < self.lifetime[:n]
+        if not alive.all():
+            # keep live particles packed at the front
+            self.count = int(alive.sum())
+            for array in (
+                self.position,
+                self.previous,
+                self.velocity,
+                self.acceleration,
+                self.age,
+                self.lifetime,
+            ):
+                array[: self.count] = array[:n][alive]
+        if self.count == 0 and self.auto_remove:
             issue_command(RemoveInstanceCMD(self))
 
+    def interpolate(self, alpha: float) -> None:
+        self.alpha = alpha
+
+    def render(self, surface: pg.Surface, camera: Camera) -> None:
+        n = self.count
+        steps = self.age[:n] * STAMP_STEPS // self.lifetime[:n]
+        corners = self.__corners() - camera.offset
+        surface.blits(
+            zip(map(self.stamps.__getitem__, steps.tolist()), corners.tolist()),
+            doreturn=False,
+        )
+
+    def get_bounds(self) -> pg.Rect:
+        n = self.count
+        if not n:
+            return pg.Rect(0, 0, 0, 0)
+        corners = self.__corners()
+        left, top = corners.min(axis=0).tolist()
+        right, bottom = (corners.max(axis=0) + self.size * 2 + 1).tolist()
+        return pg.Rect(left, top, right - left, bottom - top)
+
+    def __corners(self) -> np.ndarray:
+        position = self.position[: self.count]
+        if self.alpha != 1:
+            previous = self.previous[: self.count]
+            position = previous + (position - previous) * self.alpha
+        return position.astype(np.int64) - self.size
 
-class ExplosionEffect(Particle):
+    def __grow(self, capacity: int) -> None:
+        capacity = max(capacity, len(self.age) * 2)
+        for name in (
+            "position",
+            "previous",
+            "velocity",
+            "acceleration",
+            "age",
+            "lifetime",
+        ):
+            array = getattr(self, name)
+            grown = np.ones((capacity, *array.shape[1:]), dtype=array.dtype)
+            grown[: self.count] = array[: self.count]
+            setattr(self, name, grown)
+
+
+class ExplosionEffect(ParticleEmitter):
     def __init__(
         self,
         pos: Vector2D,
@@ -59,27 +162,30 @@ class ExplosionEffect(Particle):
         spread: int = 100,
         n: int = 100,
         lifetime: int = 200,
+        rng: random.Random | None = None,
     ) -> None:
+        super().__init__(color, 2, n)
+        self.reset(pos, color, spread, n, lifetime, rng)
+
+    def reset(
+        self,
+        pos: Vector2D,
+        color: tuple[int, int, int],
+        spread: int = 100,
+        n: int = 100,
+        lifetime: int = 200,
+        rng: random.Random | None = None,
+    ) -> None:
+        super().reset(color, 2)
         self.pos = pos
-        self.particles: list[FadingParticle] = [
-            FadingParticle(
-                pos,
-                Vector2D[Number].random(),
-                Vector2D[Number].random() * spread,
-                color,
-                2,
-                lifetime,
-                False,
-            )
-            for _ in range(n)
-        ]
+        # seeded from the stdlib generator so a seeded game covers it
+        generator = np.random.default_rng((rng or random).getrandbits(64))
+        self.emit(
+            pos,
+            generator.random((n, 2)),
+            generator.random((n, 2)) * spread,
+            lifetime,
+        )
 
-    def render(self, surface: pg.Surface) -> None:
-        for particle in self.particles:
-            particle.render(surface)
 
-    def update(self, dt: float) -> None:
-        for particle in self.particles:
-            particle.update(dt)
-        if all(particle.age >= particle.lifetime for particle in self.particles):
-            issue_command(RemoveInstanceCMD(self))
+ExplosionEffect.POOL = Pool(ExplosionEffect, capacity=32)
@@ -1,2 +1,3 @@
 from .rigidbody import *
 from .utils import *
+from .world import *
@@ -1,47 +1,107 @@
+import weakref
 from typing import NamedTuple
 
+import numpy as np
 import pygame as pg
 
-from game.interfaces import Colliable, CollisionCallback, Renderable, Updatable
+from game.interfaces import Colliable, CollisionCallback, Renderable
+from game.utils.camera import Camera
 from game.utils.ds import Number, Rect, Vector2D
+from game.utils.rect import ETA, contact_times
+
+from .world import WORLD, PhysicsWorld, PreviousRectView, RectView, VectorView
 
 DEBUG = False
 
 
-class RigidBody(Updatable):
-    GRAVITY_CONSTANT = 9.81
-    ACCELERATION_DECAY = 0.1
+class RigidBody:
+    """A body whose state lives in a PhysicsWorld.
 
-    def __init__(self, mass: float, decaying: bool = True, gravity: bool = True):
-        self.mass = mass
-        self.acceleration = Vector2D[Number](0, 0)
-        self.velocity = Vector2D[Number](0, 0)
-        self.position = Vector2D[Number](0, 0)
-        self.decaying = decaying
-        self.gravity = gravity
+    ``position``, ``velocity`` and ``acceleration`` are live views into the
+    world's arrays, and the world integrates every body at once. Assigning
+    ``position`` teleports the body, while changing it in place is
+    interpolated when rendering.
+    """
 
-    def apply_force(self, force: Vector2D[Number]):
-        self.acceleration = Vector2D[Number](
-            self.acceleration[0] + force[0] / self.mass,
-            self.acceleration[1] + force[1] / self.mass,
-        )
+    GRAVITY_CONSTANT = PhysicsWorld.GRAVITY_CONSTANT
+    ACCELERATION_DECAY = PhysicsWorld.ACCELERATION_DECAY
 
-    def update(self, dt: float):
-        self.position = Vector2D[Number](
-            self.position[0] + self.velocity[0] * dt,
-            self.position[1] + self.velocity[1] * dt,
-        )
-        self.velocity = Vector2D[Number](
-            self.velocity[0] + self.acceleration[0] * dt,
-            self.velocity[1] + self.acceleration[1] * dt,
+    def __init__(
+        self,
+        mass: float,
+        decaying: bool = True,
+        gravity: bool = True,
+        world: PhysicsWorld = WORLD,
+    ):
+        self.world = world
+        self.index = world.allocate(mass, decaying, gravity)
+        self.__position = VectorView(world, "position", self.index)
+        self.__velocity = VectorView(world, "velocity", self.index)
+        self.__acceleration = VectorView(world, "acceleration", self.index)
+        weakref.finalize(self, world.release, self.index)
+
+    @property
+    def mass(self) -> float:
+        return float(self.world.mass[self.index])
+
+    @mass.setter
+    def mass(self, value: float) -> None:
+        self.world.mass[self.index] = value
+
+    @property
+    def decaying(self) -> bool:
+        return bool(self.world.decaying[self.index])
+
+    @decaying.setter
+    def decaying(self, value: bool) -> None:
+        self.world.decaying[self.index] = value
+
+    @property
+    def gravity(self) -> bool:
+        return bool(self.world.gravity[self.index])
+
+    @gravity.setter
+    def gravity(self, value: bool) -> None:
+        self.world.gravity[self.index] = value
+
+    @property
+    def position(self) -> Vector2D[Number]:
+        return self.__position
+
+    @position.setter
+    def position(self, value: Vector2D[Number]) -> None:
+        # assigning teleports the body; it is not interpolated from where it was
+        self.world.position[self.index] = self.world.previous[self.index] = (
+            value[0],
+            value[1],
         )
-        if self.decaying:
-            self.acceleration = Vector2D[Number](
-                self.acceleration[0] * (1 - self.ACCELERATION_DECAY),
-                self.acceleration[1] * (1 - self.ACCELERATION_DECAY),
-            )
-        if self.gravity:
-            self.apply_force(Vector2D[Number](0, self.GRAVITY_CONSTANT * self.mass))
+
+    @property
+    def velocity(self) -> Vector2D[Number]:
+        return self.__velocity
+
+    @velocity.setter
+    def velocity(self, value: Vector2D[Number]) -> None:
+        self.world.velocity[self.index] = value[0], value[1]
+
+    @property
+    def acceleration(self) -> Vector2D[Number]:
+        return self.__acceleration
+
+    @acceleration.setter
+    def acceleration(self, value: Vector2D[Number]) -> None:
+        self.world.acceleration[self.index] = value[0], value[1]
+
+    def apply_force(self, force: Vector2D[Number]):
+        mass = self.world.mass[self.index]
+        self.world.acceleration[self.index] += force[0] / mass, force[1] / mass
+
+    def park(self) -> None:
+        """Hold the body still where it is, until it is given a new state."""
+        world, index = self.world, self.index
+        world.velocity[index] = world.acceleration[index] = 0
+        world.previous[index] = world.position[index]
+        world.gravity[index] = False
 
     def __repr__(self):
         return f"RigidBody({self.mass}, {self.decaying}, {self.gravity})"
@@ -50,24 +110,33 @@ class RigidBody(Updatable):
 class RigidBodyRect(RigidBody, Renderable, Colliable):
     def __init__(self, rect: Rect, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.__rect = RectView(self.world, self.index)
+        self.__previous_rect = PreviousRectView(self.world, self.index)
         self.rect = rect
 
-    def render(self, surface: pg.Surface):
+    @property
+    def rect(self) -> Rect:
+        return self.__rect
+
+    @rect.setter
+    def rect(self, value: Rect) -> None:
+        self.world.position[self.index] = self.world.previous[self.index] = (
+            value.x,
+            value.y,
+        )
+        self.resize(value.w, value.h)
+
+    def resize(self, w: Number, h: Number) -> None:
+        self.world.size[self.index] = w, h
+
+    def render(self, surface: pg.Surface, camera: Camera):
         if not DEBUG:
             return
-        self.rect.draw(surface, (255, 0, 0))
-        self.velocity.draw(surface, self.position, (0, 255, 0))
-        self.acceleration.draw(surface, self.position, (0, 0, 255))
-        self.position.draw_point(surface, (0, 0, 0))
-
-    def update(self, dt: float):
-        super().update(dt)
-        self.rect = Rect(
-            self.position[0],
-            self.position[1],
-            self.rect.width,
-            self.rect.height,
-        )
+        pg.draw.rect(surface, (255, 0, 0), camera.to_screen(self.rect), width=1)
+        position = Vector2D(*camera.point_to_screen(*self.position))
+        self.velocity.draw(surface, position, (0, 255, 0))
+        self.acceleration.draw(surface, position, (0, 0, 255))
+        position.draw_point(surface, (0, 0, 0))
 
     def collide(self, other: Colliable) -> bool:
         return self.rect.collide(other.get_rect())
@@ -80,6 +149,16 @@ class RigidBodyRect(RigidBody, Renderable, Colliable):
     def get_rect(self) -> Rect:
         return self.rect
 
+    def get_previous_rect(self) -> Rect:
+        # a live view, so sweeping every body allocates nothing
+        return self.__previous_rect
+
+    def rewind(self, toi: float) -> None:
+        position, previous = self.world.position, self.world.previous
+        position[self.index] = previous[self.index] + toi * (
+            position[self.index] - previous[self.index]
+        )
+
     def get_velocity(self) -> "Vector2D[Number]":
         return self.velocity
 
@@ -89,7 +168,7 @@ class RigidBodyRect(RigidBody, Renderable, Colliable):
 
     @x.setter
     def x(self, value):
-        self.position = Vector2D[Number](value, self.position[1])
+        self.world.position[self.index, 0] = value
 
     @property
     def y(self):
@@ -97,7 +176,7 @@ class RigidBodyRect(RigidBody, Renderable, Colliable):
 
     @y.setter
     def y(self, value):
-        self.position = Vector2D[Number](self.position[0], value)
+        self.world.position[self.index, 1] = value
 
     def __repr__(self):
         return f"RigidBodyRect({self.rect}, {self.mass}g, {self.position}, {self.velocity}, {self.acceleration})"
@@ -111,45 +190,117 @@ class ContactResult(NamedTuple):
     time_of_contact: float
 
 
-ETA = 1e-6
-
-
-def prevent_zero(x: float) -> float:
-    return x if abs(x) > ETA else ETA if x > 0 else -ETA
-
-
 def calculate_contact(
     a: Rect,
     b: Rect,
     v_a: Vector2D[Number],
     v_b: Vector2D[Number],
-) -> ContactResult:
-    t_x_enter = (b.left - a.right) / prevent_zero(v_a[0] - v_b[0])
-    t_x_exit = (b.right - a.left) / prevent_zero(v_a[0] - v_b[0])
-    t_y_enter = (b.top - a.bottom) / prevent_zero(v_a[1] - v_b[1])
-    t_y_exit = (b.bottom - a.top) / prevent_zero(v_a[1] - v_b[1])
-
-    t_contact = max(min(t_x_enter, t_x_exit), min(t_y_enter, t_y_exit))
-    t_exit = min(max(t_x_enter, t_x_exit), max(t_y_enter, t_y_exit))
-
+) -> ContactResult | None:
+    """Contact of ``a`` and ``b`` moving at ``v_a`` and ``v_b``, or None if
+    they are not heading into each other."""
+    v_ax, v_ay, v_bx, v_by = v_a.x, v_a.y, v_b.x, v_b.y
+    t_contact, t_exit = contact_times(a, b, v_ax - v_bx, v_ay - v_by)
     if t_contact > t_exit or t_exit < 0:
-        raise ValueError("No collision")
+        return None
+
+    # edges are read once into locals; Rect.left/right/... would recompute
+    a_left, a_top, a_w, a_h = a.x, a.y, a.w, a.h
+    b_left, b_top, b_w, b_h = b.x, b.y, b.w, b.h
+    a_right, a_bottom = a_left + a_w, a_top + a_h
+    b_right, b_bottom = b_left + b_w, b_top + b_h
 
     penetration = min(
-        a.right - b.left,
-        b.right - a.left,
-        a.bottom - b.top,
-        b.bottom - a.top,
+        a_right - b_left,
+        b_right - a_left,
+        a_bottom - b_top,
+        b_bottom - a_top,
+    )
+    # both rects at the time of contact
+    a_left += v_ax * t_contact
+    a_top += v_ay * t_contact
+    a_right, a_bottom = a_left + a_w, a_top + a_h
+    b_left += v_bx * t_contact
+    b_top += v_by * t_contact
+    b_right, b_bottom = b_left + b_w, b_top + b_h
+    # the middle two of the four edges on each axis bound the overlap
+    contact_x = (max(a_left, b_left) + min(a_right, b_right)) / 2
+    contact_y = (max(a_top, b_top) + min(a_bottom, b_bottom)) / 2
+
+    normal_x = 1 if contact_x == a_left else -1 if contact_x == a_right else 0
+    normal_y = 1 if contact_y == a_top else -1 if contact_y == a_bottom else 0
+    return ContactResult(
+        Vector2D(contact_x, contact_y),
+        Vector2D(normal_x, normal_y),
+        Vector2D(-normal_y, normal_x),
+        penetration,
+        t_contact,
+    )
+
+
+class Contacts(NamedTuple):
+    """``ContactResult`` fields of many pairs, one row each.
+
+    Rows where ``hits`` is False have no contact and hold meaningless values.
+    """
+
+    points: np.ndarray
+    normals: np.ndarray
+    planes: np.ndarray
+    penetration_depths: np.ndarray
+    times_of_contact: np.ndarray
+    hits: np.ndarray
+
+
+def calculate_contacts(
+    a: np.ndarray,
+    b: np.ndarray,
+    v_a: np.ndarray,
+    v_b: np.ndarray,
+) -> Contacts:
+    """``calculate_contact`` for rows of ``(x, y, w, h)`` rects and ``(x, y)``
+    velocities, giving the same results for every pair that hits."""
+    a_left, a_top, a_w, a_h = a.T
+    b_left, b_top, b_w, b_h = b.T
+    v = v_a - v_b
+    v = np.where(np.abs(v) > ETA, v, np.where(v > 0, ETA, -ETA))
+    v_x, v_y = v.T
+
+    t_x_enter = (b_left - (a_left + a_w)) / v_x
+    t_x_exit = (b_left + b_w - a_left) / v_x
+    t_y_enter = (b_top - (a_top + a_h)) / v_y
+    t_y_exit = (b_top + b_h - a_top) / v_y
+    t_contact = np.maximum(
+        np.minimum(t_x_enter, t_x_exit), np.minimum(t_y_enter, t_y_exit)
+    )
+    t_exit = np.minimum(
+        np.maximum(t_x_enter, t_x_exit), np.maximum(t_y_enter, t_y_exit)
+    )
+    hits = (t_contact <= t_exit) & (t_exit >= 0)
+
+    a_right, a_bottom = a_left + a_w, a_top + a_h
+    b_right, b_bottom = b_left + b_w, b_top + b_h
+    penetration = np.minimum(
+        np.minimum(a_right - b_left, b_right - a_left),
+        np.minimum(a_bottom - b_top, b_bottom - a_top),
     )
-    a = a.move(v_a * t_contact)
-    b = b.move(v_b * t_contact)
-    xs = sorted([a.left, a.right, b.left, b.right])[1:3]
-    ys = sorted([a.top, a.bottom, b.top, b.bottom])[1:3]
-    contact = Vector2D[Number]((xs[0] + xs[1]) / 2, (ys[0] + ys[1]) / 2)
-
-    normal = Vector2D[Number](
-        1 if contact[0] == a.left else -1 if contact[0] == a.right else 0,
-        1 if contact[1] == a.top else -1 if contact[1] == a.bottom else 0,
+    # both rects at the time of contact
+    a_left = a_left + v_a[:, 0] * t_contact
+    a_top = a_top + v_a[:, 1] * t_contact
+    a_right, a_bottom = a_left + a_w, a_top + a_h
+    b_left = b_left + v_b[:, 0] * t_contact
+    b_top = b_top + v_b[:, 1] * t_contact
+    b_right, b_bottom = b_left + b_w, b_top + b_h
+    # the middle two of the four edges on each axis bound the overlap
+    contact_x = (np.maximum(a_left, b_left) + np.minimum(a_right, b_right)) / 2
+    contact_y = (np.maximum(a_top, b_top) + np.minimum(a_bottom, b_bottom)) / 2
+
+    normal_x = np.select((contact_x == a_left, contact_x == a_right), (1, -1))
+    normal_y = np.select((contact_y == a_top, contact_y == a_bottom), (1, -1))
+    return Contacts(
+        np.column_stack((contact_x, contact_y)),
+        np.column_stack((normal_x, normal_y)),
+        np.column_stack((-normal_y, normal_x)),
+        penetration,
+        t_contact,
+        hits,
     )
-    plane = Vector2D[Number](-normal[1], normal[0])
-    return ContactResult(contact, normal, plane, penetration, t_contact)
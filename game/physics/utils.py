@@ -1,20 +1,42 @@
-from game.physics import calculate_contact
-from game.utils import Number, Vector2D
+from collections.abc import Sequence
+
+import numpy as np
+
+from game.physics import (
+    Contacts,
+    PhysicsWorld,
+    calculate_contact,
+    calculate_contacts,
+)
+
+# fewer collisions than this are cheaper to resolve one at a time
+BATCH_MIN = 32
 
 
 def handle_collision(collision, rb, dt):
+    """Push ``rb`` out of ``collision.b`` and bounce it off.
+
+    Returns the contact, or None if they are already moving apart.
+    """
     result = calculate_collision(collision, rb)
+    if result is None:
+        return None
+    normal, plane, depth = result.normal, result.plane, result.penetration_depth
+    position, velocity, acceleration = rb.position, rb.velocity, rb.acceleration
 
-    rb.position = rb.position + result.normal * result.penetration_depth
-    rb.position += (
-        rb.velocity * Vector2D[Number](abs(result.plane.x), abs(result.plane.y)) * dt
-        + rb.acceleration
-        * Vector2D[Number](abs(result.plane.x), abs(result.plane.y))
-        * dt
+    # push out along the normal, then slide along the contact plane
+    plane_x, plane_y = abs(plane.x), abs(plane.y)
+    position.set(
+        position.x
+        + normal.x * depth
+        + (velocity.x * plane_x * dt + acceleration.x * plane_x * dt),
+        position.y
+        + normal.y * depth
+        + (velocity.y * plane_y * dt + acceleration.y * plane_y * dt),
     )
 
-    rb.velocity = rb.velocity.reflect(result.plane) * 0.5
-    rb.acceleration = rb.acceleration.reflect(result.plane) * 0.5
+    velocity.ireflect(plane).imul(0.5)
+    acceleration.ireflect(plane).imul(0.5)
     return result
 
 
@@ -26,3 +48,94 @@ def calculate_collision(collision, rb):
         collision.b.get_velocity(),
     )
     return result
+
+
+def handle_collisions(collisions: Sequence, bodies: Sequence, dt: float) -> Contacts:
+    """``handle_collision`` of each collision with the body at the same index.
+
+    The bodies must share a world. A body in several collisions is resolved
+    against each in turn, as if they were handled one at a time.
+    """
+    world: PhysicsWorld = bodies[0].world
+    indices = np.array([rb.index for rb in bodies], dtype=np.intp)
+    others = [collision.b.get_rect() for collision in collisions]
+    b = np.array([(r.x, r.y, r.w, r.h) for r in others], dtype=float)
+    v_b = np.array(
+        [tuple(collision.b.get_velocity()) for collision in collisions], dtype=float
+    )
+
+    # each round resolves a body at most once, after its earlier collisions
+    rounds = np.empty(len(indices), dtype=np.intp)
+    seen: dict[int, int] = {}
+    for row, index in enumerate(indices.tolist()):
+        rounds[row] = seen.get(index, 0)
+        seen[index] = rounds[row] + 1
+
+    if len(seen) == len(indices):
+        return resolve_contacts(world, indices, b, v_b, dt)
+    parts = []
+    for turn in range(max(seen.values())):
+        rows = np.flatnonzero(rounds == turn)
+        contacts = resolve_contacts(world, indices[rows], b[rows], v_b[rows], dt)
+        parts.append((rows, contacts))
+    fields = []
+    for field in range(len(Contacts._fields)):
+        first = parts[0][1][field]
+        values = np.empty((len(indices), *first.shape[1:]), dtype=first.dtype)
+        for rows, contacts in parts:
+            values[rows] = contacts[field]
+        fields.append(values)
+    return Contacts(*fields)
+
+
+def resolve_contacts(
+    world: PhysicsWorld,
+    indices: np.ndarray,
+    b: np.ndarray,
+    v_b: np.ndarray,
+    dt: float,
+) -> Contacts:
+    """Resolve distinct bodies against ``(x, y, w, h)`` rects moving at ``v_b``."""
+    position = world.position[indices]
+    velocity = world.velocity[indices]
+    acceleration = world.acceleration[indices]
+    contacts = calculate_contacts(
+        np.hstack((position, world.size[indices])), b, velocity, v_b
+    )
+
+    hits = contacts.hits
+    indices = indices[hits]
+    normal, plane = contacts.normals[hits], contacts.planes[hits]
+    depth = contacts.penetration_depths[hits, None]
+    velocity, acceleration = velocity[hits], acceleration[hits]
+    slide = np.abs(plane)
+    world.position[indices] = (
+        position[hits]
+        + normal * depth
+        + (velocity * slide * dt + acceleration * slide * dt)
+    )
+    world.velocity[indices] = reflect(velocity, plane) * 0.5
+    world.acceleration[indices] = reflect(acceleration, plane) * 0.5
+    return contacts
+
+
+def reflect(vectors: np.ndarray, planes: np.ndarray) -> np.ndarray:
+    """``Vector2D.ireflect`` of each row of ``vectors`` in that row of ``planes``."""
+    x, y = vectors.T
+    plane_x, plane_y = planes.T
+    # a vertical, or zero, plane flips x
+    reflected = np.column_stack((-x, y))
+    horizontal = (plane_x != 0) & (plane_y == 0)
+    reflected[horizontal, 1] = -y[horizontal]
+    reflected[horizontal, 0] = x[horizontal]
+    diagonal = (plane_x != 0) & (plane_y != 0)
+    if diagonal.any():
+        x, y = x[diagonal], y[diagonal]
+        slope = plane_y[diagonal] / plane_x[diagonal]
+        intercept = y - slope * x
+        reflected_x = (x - slope * (y - intercept)) / (slope**2 + 1)
+        reflected_y = slope * reflected_x + intercept
+        reflected[diagonal] = np.column_stack(
+            (2 * reflected_x - x, 2 * reflected_y - y)
+        )
+    return reflected
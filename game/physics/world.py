@@ -0,0 +1,220 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import numpy as np
+
+from game.interfaces import Updatable
+from game.utils.ds import Number, Rect, Vector2D
+
+
+class PhysicsWorld(Updatable):
+    """Struct-of-arrays storage for every rigid body, integrated in one step."""
+
+    GRAVITY_CONSTANT = 9.81
+    ACCELERATION_DECAY = 0.1
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.mass = np.ones(capacity)
+        self.position = np.zeros((capacity, 2))
+        # positions at the end of the previous step, for render interpolation
+        self.previous = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.acceleration = np.zeros((capacity, 2))
+        self.size = np.zeros((capacity, 2))
+        self.decaying = np.zeros(capacity, dtype=bool)
+        self.gravity = np.zeros(capacity, dtype=bool)
+        self.free = list(range(capacity - 1, -1, -1))
+        # one past the highest slot ever handed out
+        self.count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self.mass)
+
+    def allocate(self, mass: float, decaying: bool, gravity: bool) -> int:
+        if not self.free:
+            self.__grow()
+        index = self.free.pop()
+        self.mass[index] = mass
+        self.decaying[index] = decaying
+        self.gravity[index] = gravity
+        self.count = max(self.count, index + 1)
+        return index
+
+    def release(self, index: int) -> None:
+        self.position[index] = self.velocity[index] = self.acceleration[index] = 0
+        self.previous[index] = 0
+        self.size[index] = 0
+        self.decaying[index] = self.gravity[index] = False
+        self.free.append(index)
+
+    def update(self, dt: float) -> None:
+        n = self.count
+        position, velocity, acceleration = (
+            self.position[:n],
+            self.velocity[:n],
+            self.acceleration[:n],
+        )
+        self.previous[:n] = position
+        position += velocity * dt
+        velocity += acceleration * dt
+        np.multiply(
+            acceleration,
+            1 - self.ACCELERATION_DECAY,
+            out=acceleration,
+            where=self.decaying[:n, None],
+        )
+        np.add(
+            acceleration[:, 1],
+            self.GRAVITY_CONSTANT,
+            out=acceleration[:, 1],
+            where=self.gravity[:n],
+        )
+
+    @contextmanager
+    def interpolated(self, alpha: float) -> Iterator[None]:
+        """Move every body ``alpha`` of the way from its previous position."""
+        if alpha == 1:
+            yield
+            return
+        n = self.count
+        position, previous = self.position[:n], self.previous[:n]
+        current = position.copy()
+        np.subtract(current, previous, out=position)
+        position *= alpha
+        position += previous
+        try:
+            yield
+        finally:
+            position[:] = current
+
+    def __grow(self) -> None:
+        old = self.capacity
+        for name in (
+            "mass",
+            "position",
+            "previous",
+            "velocity",
+            "acceleration",
+            "size",
+        ):
+            array = getattr(self, name)
+            grown = np.zeros((old * 2, *array.shape[1:]), dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        for name in ("decaying", "gravity"):
+            grown = np.zeros(old * 2, dtype=bool)
+            grown[:old] = getattr(self, name)
+            setattr(self, name, grown)
+        self.free.extend(range(old * 2 - 1, old - 1, -1))
+
+    def __repr__(self) -> str:
+        return f"PhysicsWorld({self.capacity - len(self.free)}/{self.capacity})"
+
+
+class VectorView(Vector2D[Number]):
+    """A live Vector2D backed by one row of a PhysicsWorld array."""
+
+    __slots__ = ("world", "field", "index")
+
+    def __init__(self, world: PhysicsWorld, field: str, index: int) -> None:
+        self.world = world
+        self.field = field
+        self.index = index
+
+    @property
+    def x(self) -> Number:
+        return float(getattr(self.world, self.field)[self.index, 0])
+
+    @x.setter
+    def x(self, value: Number) -> None:
+        getattr(self.world, self.field)[self.index, 0] = value
+
+    @property
+    def y(self) -> Number:
+        return float(getattr(self.world, self.field)[self.index, 1])
+
+    @y.setter
+    def y(self, value: Number) -> None:
+        getattr(self.world, self.field)[self.index, 1] = value
+
+    def set(self, x: Number, y: Number) -> "VectorView":
+        getattr(self.world, self.field)[self.index] = x, y
+        return self
+
+
+class RectView(Rect):
+    """A live Rect whose origin is a body's position and extent its size."""
+
+    __slots__ = ("world", "index")
+
+    def __init__(self, world: PhysicsWorld, index: int) -> None:
+        self.world = world
+        self.index = index
+
+    @property
+    def x(self) -> Number:
+        return float(self.world.position[self.index, 0])
+
+    @x.setter
+    def x(self, value: Number) -> None:
+        self.world.position[self.index, 0] = value
+
+    @property
+    def y(self) -> Number:
+        return float(self.world.position[self.index, 1])
+
+    @y.setter
+    def y(self, value: Number) -> None:
+        self.world.position[self.index, 1] = value
+
+    @property
+    def w(self) -> Number:
+        return float(self.world.size[self.index, 0])
+
+    @w.setter
+    def w(self, value: Number) -> None:
+        self.world.size[self.index, 0] = value
+
+    @property
+    def h(self) -> Number:
+        return float(self.world.size[self.index, 1])
+
+    @h.setter
+    def h(self, value: Number) -> None:
+        self.world.size[self.index, 1] = value
+
+    def set(self, x: Number, y: Number, w: Number, h: Number) -> "RectView":
+        self.world.position[self.index] = x, y
+        self.world.size[self.index] = w, h
+        return self
+
+
+class PreviousRectView(RectView):
+    """A live Rect of where a body was at the end of the previous step."""
+
+    __slots__ = ()
+
+    @property
+    def x(self) -> Number:
+        return float(self.world.previous[self.index, 0])
+
+    @x.setter
+    def x(self, value: Number) -> None:
+        self.world.previous[self.index, 0] = value
+
+    @property
+    def y(self) -> Number:
+        return float(self.world.previous[self.index, 1])
+
+    @y.setter
+    def y(self, value: Number) -> None:
+        self.world.previous[self.index, 1] = value
+
+    def set(self, x: Number, y: Number, w: Number, h: Number) -> "PreviousRectView":
+        self.world.previous[self.index] = x, y
+        self.world.size[self.index] = w, h
+        return self
+
+
+WORLD = PhysicsWorld()
@@ -1,7 +1,10 @@
+import random
+from collections.abc import Callable, Sequence
 from enum import Enum
 
 import pygame as pg
 
+from .audio import AUDIO
 from .burger import Burger, BurgerLayer
 from .command import AddInstanceCMD, RemoveInstanceCMD, issue_command
 from .interfaces import (
@@ -14,7 +17,7 @@ from .interfaces import (
 from .monster import Monster
 from .particle import ExplosionEffect
 from .physics import RigidBodyRect, Vector2D, calculate_collision, handle_collision
-from .utils import Rect, load_im
+from .utils import Camera, Rect, lazy_im
 from .wall import Wall
 
 
@@ -29,25 +32,37 @@ class Player(pg.sprite.Sprite, PlayInstance):
         JUMP = 2
         DIVE = 3
 
+    SPRITES = {
+        State.WALK_RIGHT: lazy_im("catwalk-2.png"),
+        State.WALK_LEFT: lazy_im("catwalk-1.png"),
+        State.JUMP: lazy_im("catjump.png"),
+        State.DIVE: lazy_im("catfall.png"),
+    }
+
     def __init__(
         self,
         speed: float = 128,
+        controls: Callable[[], Sequence[bool]] = pg.key.get_pressed,
+        rng: random.Random | None = None,
     ) -> None:
         super().__init__()
         self.speed = speed
-        self.image = load_im("catwalk-1.png")
+        self.controls = controls
+        self.rng = rng or random.Random()
+        self.image = Player.SPRITES[Player.State.WALK_LEFT].get()
 
         self.rb: RigidBodyRect
         self.__update_state(Player.State.WALK_LEFT)
 
         self.burger = Burger()
+        self.burger_anchor = Vector2D(0, 0)
         self.health = 100
         self.score = 0
 
         self.dt = 0
 
     def update(self, dt: float):
-        keys = pg.key.get_pressed()
+        keys = self.controls()
 
         match self.state:
             case Player.State.WALK_LEFT | Player.State.WALK_RIGHT:
@@ -69,27 +84,25 @@ class Player(pg.sprite.Sprite, PlayInstance):
             case Player.State.DIVE:
                 self.__handle_move(keys)
 
-        self.rb.update(dt)
+        self.dt = dt
+
+    def carry_burger(self) -> None:
+        """Stack the burger on the player where the physics step left it."""
+        rect = self.rb.rect
         self.burger.move_to(
-            self.rb.position
-            + Vector2D((self.rb.rect.width - 48) / 2, self.rb.rect.height / 2)
+            self.burger_anchor.set(
+                rect.x + (rect.w - 48) / 2,
+                rect.y + rect.h / 2,
+            )
         )
-        self.dt = dt
 
     def __update_state(self, state: State):
         if state == getattr(self, "state", None):
             return
-        if state == Player.State.WALK_LEFT:
-            self.image = load_im("catwalk-1.png")
-        elif state == Player.State.WALK_RIGHT:
-            self.image = load_im("catwalk-2.png")
-        elif state == Player.State.JUMP:
-            self.image = load_im("catjump.png")
-        elif state == Player.State.DIVE:
-            self.image = load_im("catfall.png")
+        self.image = Player.SPRITES[state].get()
 
         if getattr(self, "rb", None):
-            self.rb.rect = Rect.from_pygame(self.image.get_rect())
+            self.rb.resize(*self.image.get_size())
         else:
             self.rb = RigidBodyRect(
                 Rect.from_pygame(self.image.get_rect()),
@@ -100,12 +113,14 @@ class Player(pg.sprite.Sprite, PlayInstance):
 
         self.state = state
 
-    def render(self, surface: pg.Surface):
-        self.rb.render(surface)
-        surface.blit(self.image, self.rb.rect.to_pygame())
+    def render(self, surface: pg.Surface, camera: Camera):
+        self.rb.render(surface, camera)
+        surface.blit(self.image, camera.to_screen(self.rb.rect))
 
     def wall_collide(self, collision: Collision):
         result = handle_collision(collision, self.rb, self.dt)
+        if result is None:
+            return
         if result.normal == Vector2D(0, 0):
             return
         if result.normal == Vector2D(0, -1):
@@ -113,16 +128,20 @@ class Player(pg.sprite.Sprite, PlayInstance):
 
     def layer_collide(self, collision: Collision):
         assert isinstance(collision.b, BurgerLayer)
+        if collision.b not in self.burger.layers:
+            AUDIO.play("catch")
         self.burger.add_layer(collision.b)
         self.score = len(self.burger.layers) * 20
 
     def monster_collide(self, collision: Collision):
         assert isinstance(collision.b, Monster)
         result = calculate_collision(collision, self.rb)
-        issue_command(
-            AddInstanceCMD(ExplosionEffect(result.point, (255, 0, 0)))
-        )  # red explosion
+        # None if they passed through each other between ticks
+        point = result.point if result else collision.b.get_rect().center
+        explosion = ExplosionEffect.POOL.acquire(point, (255, 0, 0), rng=self.rng)
+        issue_command(AddInstanceCMD(explosion))  # red explosion
         self.health -= 10
+        AUDIO.play("hit")
         issue_command(RemoveInstanceCMD(collision.b))
 
     def get_callbacks(self) -> list[tuple[CollisionCallback, type["Colliable"]]]:
@@ -138,6 +157,12 @@ class Player(pg.sprite.Sprite, PlayInstance):
     def get_rect(self) -> Rect:
         return self.rb.get_rect()
 
+    def get_previous_rect(self) -> Rect:
+        return self.rb.get_previous_rect()
+
+    def rewind(self, toi: float) -> None:
+        self.rb.rewind(toi)
+
     def get_velocity(self) -> "Vector2D":
         return self.rb.velocity
 
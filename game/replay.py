@@ -0,0 +1,232 @@
+"""Record the input of a session and replay it headless, as fast as it runs.
+
+A game is deterministic given its seed and the keys held on each tick, so a
+recording stores only those: the seed, then the key state as runs of
+``(keys, ticks held)``. Set ``GAME_RECORD=session.rpl`` to record a session,
+then replay it, optionally under the profiler:
+
+    python -m game.replay session.rpl --profile --trace session.json
+"""
+import argparse
+import hashlib
+import os
+import struct
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import pygame as pg
+
+from .constants import SIZE
+from .game import Game
+from .utils import PROFILER
+
+# keys the game reads, one bit each
+KEYS = (pg.K_LEFT, pg.K_RIGHT, pg.K_UP, pg.K_DOWN, pg.K_SPACE)
+
+MAGIC = b"GRPL"
+VERSION = 1
+# magic, version, seed, tick rate, ticks, state digest
+HEADER = struct.Struct("<4sBQHI8s")
+
+
+def state_digest(game: Game) -> bytes:
+    """Fingerprint of a game's state, to tell whether a replay diverged."""
+    position = game.player.rb.position
+    state = struct.pack(
+        "<IiiddI",
+        game.tick,
+        game.player.score,
+        game.player.health,
+        position[0],
+        position[1],
+        len(game.entities),
+    )
+    return hashlib.blake2b(state, digest_size=8).digest()
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Recording:
+    """Seed and per-tick key state of a session."""
+
+    def __init__(
+        self,
+        seed: int,
+        tick_rate: int = Game.TICK_RATE,
+        masks: bytearray | None = None,
+        digest: bytes = bytes(8),
+    ) -> None:
+        self.seed = seed
+        self.tick_rate = tick_rate
+        # bit i is set while KEYS[i] is held, one byte per tick
+        self.masks = masks if masks is not None else bytearray()
+        # state_digest of the game when recording stopped, zero if unknown
+        self.digest = digest
+
+    def save(self, path: str | Path) -> None:
+        out = bytearray(
+            HEADER.pack(
+                MAGIC, VERSION, self.seed, self.tick_rate, len(self.masks), self.digest
+            )
+        )
+        start = 0
+        while start < len(self.masks):
+            mask = self.masks[start]
+            end = start + 1
+            while end < len(self.masks) and self.masks[end] == mask:
+                end += 1
+            out.append(mask)
+            write_varint(out, end - start)
+            start = end
+        Path(path).write_bytes(out)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Recording":
+        data = Path(path).read_bytes()
+        magic, version, seed, tick_rate, ticks, digest = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} recording")
+        masks = bytearray()
+        offset = HEADER.size
+        while len(masks) < ticks:
+            mask = data[offset]
+            run, offset = read_varint(data, offset + 1)
+            masks.extend(bytes((mask,)) * run)
+        return cls(seed, tick_rate, masks, digest)
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+
+class Recorder:
+    """Stands in for ``pg.key.get_pressed``, recording what it returns.
+
+    The game reads the keys once a tick, so each call records one tick.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        controls: Callable[[], Sequence[bool]] = pg.key.get_pressed,
+    ) -> None:
+        self.recording = Recording(seed)
+        self.controls = controls
+
+    def __call__(self) -> Sequence[bool]:
+        keys = self.controls()
+        mask = 0
+        for bit, key in enumerate(KEYS):
+            if keys[key]:
+                mask |= 1 << bit
+        self.recording.masks.append(mask)
+        return keys
+
+    def save(self, path: str | Path, game: Game) -> None:
+        self.recording.digest = state_digest(game)
+        self.recording.save(path)
+
+
+class KeyMask:
+    """Stands in for ``pg.key.get_pressed``, holding the keys set in ``mask``."""
+
+    def __init__(self, mask: int = 0) -> None:
+        self.mask = mask
+
+    def __call__(self) -> "KeyMask":
+        return self
+
+    def __getitem__(self, key: int) -> bool:
+        return key in KEYS and bool(self.mask >> KEYS.index(key) & 1)
+
+
+class Playback(KeyMask):
+    """Stands in for ``pg.key.get_pressed``, replaying a recording."""
+
+    def __init__(self, recording: Recording) -> None:
+        super().__init__()
+        self.masks = recording.masks
+        self.tick = 0
+
+    def __call__(self) -> "Playback":
+        self.mask = self.masks[self.tick]
+        self.tick += 1
+        return self
+
+
+def replay(
+    surface: pg.Surface,
+    recording: Recording,
+    render: bool = False,
+    profile: bool = False,
+    detailed: bool = False,
+) -> Game:
+    """Re-run ``recording`` on a fresh game, without waiting on a clock."""
+    game = Game(
+        surface, lambda *_: None, recording.seed, Playback(recording), music=False
+    )
+    dt = 1 / recording.tick_rate
+    if profile:
+        PROFILER.clear(len(recording))
+        PROFILER.enabled, PROFILER.detailed = True, detailed
+    for _ in range(len(recording)):
+        with PROFILER.frame():
+            game.step(dt, render)
+    PROFILER.enabled = False
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="a recording made with GAME_RECORD set")
+    parser.add_argument("--render", action="store_true")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument(
+        "--detail", action="store_true", help="also time inside the handlers"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="write the replay as Chrome trace-event JSON (implies --profile)",
+    )
+    args = parser.parse_args()
+
+    recording = Recording.load(args.path)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pg.init()
+    surface = pg.display.set_mode(SIZE, pg.SRCALPHA)
+    profile = args.profile or args.detail or bool(args.trace)
+    game = replay(surface, recording, args.render, profile, args.detail)
+
+    print(f"seed={recording.seed} ticks={len(recording)}")
+    if recording.digest != bytes(8):
+        matched = state_digest(game) == recording.digest
+        print("final state", "matches" if matched else "DIFFERS from", "the recording")
+    if profile:
+        for name, summary in PROFILER.summary().items():
+            print(
+                f"  {name:>20}: {summary.mean:8.3f} ms/tick"
+                f" p50={summary.p50:.3f} p95={summary.p95:.3f} p99={summary.p99:.3f}"
+            )
+        if args.trace:
+            PROFILER.export(args.trace)
+
+
+if __name__ == "__main__":
+    main()
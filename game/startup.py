@@ -0,0 +1,41 @@
+"""Time from importing the package to the first frame on screen."""
+import os
+import sys
+import time
+from logging import getLogger
+
+log = getLogger(__name__)
+
+# recorded before anything else in the package is imported
+STARTED = time.perf_counter()
+# set to print the report to stderr as well as logging it
+REPORT_ENV = "GAME_STARTUP_REPORT"
+
+
+class StartupReport:
+    def __init__(self, started: float = STARTED) -> None:
+        self.started = started
+        # milestone -> seconds since ``started``, in the order reached
+        self.marks: dict[str, float] = {}
+        self.reported = False
+
+    def mark(self, name: str) -> None:
+        """Record reaching ``name``; only the first time counts."""
+        self.marks.setdefault(name, time.perf_counter() - self.started)
+
+    def report(self) -> None:
+        if self.reported:
+            return
+        self.reported = True
+        lines, previous = [], 0.0
+        for name, at in self.marks.items():
+            lines.append(
+                f"{name:>12}: {at * 1000:8.1f} ms (+{(at - previous) * 1000:.1f})"
+            )
+            previous = at
+        log.info("startup\n%s", "\n".join(lines))
+        if os.environ.get(REPORT_ENV):
+            print("\n".join(lines), file=sys.stderr)
+
+
+STARTUP = StartupReport()
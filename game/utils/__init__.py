@@ -1,4 +1,9 @@
+from .camera import *
 from .draw import *
 from .ds import *
+from .font import *
 from .loader import *
+from .pool import *
+from .profiler import *
 from .rect import *
+from .spatial import *
@@ -0,0 +1,163 @@
+"""Every image under ``data/`` packed into one atlas of raw pixels.
+
+The atlas is written next to a JSON manifest giving each image's area and
+the size and mtime of the file it came from. Loading memory-maps the atlas,
+converts it to the display format once and hands out subsurfaces, instead of
+decoding and converting every image file separately.
+
+    python -m game.utils.bundle
+"""
+import json
+import mmap
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+import pygame as pg
+
+BUNDLE_NAME = "assets"
+IMAGE_SUFFIXES = (".png", ".jpg")
+# pixels are stored unpadded in this order, four bytes each
+PIXEL_FORMAT = "RGBA"
+
+
+def image_paths(data_dir: Path) -> list[Path]:
+    return sorted(
+        path
+        for path in data_dir.rglob("*")
+        if path.suffix in IMAGE_SUFFIXES and path.is_file()
+    )
+
+
+def stamp(path: Path) -> list[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def keyed(image: pg.Surface) -> np.ndarray:
+    """``image`` as RGBA rows, its top-left colour made transparent.
+
+    This is how ``load_im`` colour-keys images by default; keys compare RGB
+    only, so clearing alpha draws the same as blitting with the key set.
+    """
+    width, height = image.get_size()
+    pixels = np.frombuffer(
+        bytearray(pg.image.tobytes(image, PIXEL_FORMAT)), np.uint8
+    ).reshape(height, width, 4)
+    pixels[(pixels[..., :3] == pixels[0, 0, :3]).all(axis=-1), 3] = 0
+    return pixels
+
+
+def pack(sizes: list[tuple[int, int]], width: int) -> tuple[list[pg.Rect], int]:
+    """Shelf-pack ``sizes`` into rows of ``width``; returns areas and height."""
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    areas = [pg.Rect(0, 0, 0, 0)] * len(sizes)
+    x = y = shelf = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width:
+            x, y, shelf = 0, y + shelf, 0
+        areas[i] = pg.Rect(x, y, w, h)
+        x += w
+        shelf = max(shelf, h)
+    return areas, y + shelf
+
+
+def build(data_dir: Path, width: int = 1024) -> Path:
+    """Pack every image in ``data_dir``; returns the manifest path."""
+    paths = image_paths(data_dir)
+    images = [keyed(pg.image.load(str(path))) for path in paths]
+    width = max([width, *(image.shape[1] for image in images)])
+    areas, height = pack([(image.shape[1], image.shape[0]) for image in images], width)
+
+    atlas = np.zeros((max(height, 1), width, 4), np.uint8)
+    for image, area in zip(images, areas):
+        atlas[area.top : area.bottom, area.left : area.right] = image
+    (data_dir / f"{BUNDLE_NAME}.bin").write_bytes(atlas.tobytes())
+    manifest = data_dir / f"{BUNDLE_NAME}.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "format": PIXEL_FORMAT,
+                "size": [width, len(atlas)],
+                "images": {
+                    path.relative_to(data_dir).as_posix(): {
+                        "area": list(area),
+                        "source": stamp(path),
+                    }
+                    for path, area in zip(paths, areas)
+                },
+            },
+            indent=2,
+        )
+    )
+    return manifest
+
+
+class Bundle:
+    """A built atlas, opened lazily; images missing or stale in it return None.
+
+    ``has`` only reads the manifest and maps the pixels, so a prefetch thread
+    may call it; ``get`` converts the atlas and belongs on the main thread.
+    """
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = data_dir
+        self.images: dict[str, dict] | None = None
+        self.pixels: mmap.mmap | None = None
+        self.atlas: pg.Surface | None = None
+        self.converted = False
+        self.lock = Lock()
+
+    def has(self, path: Path) -> bool:
+        return self.__entry(path) is not None
+
+    def get(self, path: Path) -> pg.Surface | None:
+        """Colour-keyed image at ``path`` as a subsurface of the atlas."""
+        entry = self.__entry(path)
+        if entry is None:
+            return None
+        with self.lock:
+            if not self.converted and pg.display.get_surface() is not None:
+                # one conversion for the whole atlas; earlier subsurfaces keep
+                # pointing at the unconverted one
+                self.atlas = self.atlas.convert_alpha()
+                self.converted = True
+            return self.atlas.subsurface(entry["area"])
+
+    def __entry(self, path: Path) -> dict | None:
+        with self.lock:
+            if not self.__open():
+                return None
+        try:
+            name = path.relative_to(self.data_dir).as_posix()
+        except ValueError:
+            return None
+        entry = self.images.get(name)
+        if entry is None or entry["source"] != stamp(path):
+            return None
+        return entry
+
+    def __open(self) -> bool:
+        if self.images is not None:
+            return self.atlas is not None
+        self.images = {}
+        manifest = self.data_dir / f"{BUNDLE_NAME}.json"
+        pixels = self.data_dir / f"{BUNDLE_NAME}.bin"
+        if not manifest.exists() or not pixels.exists():
+            return False
+        info = json.loads(manifest.read_text())
+        size = tuple(info["size"])
+        with open(pixels, "rb") as file:
+            self.pixels = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.pixels) != size[0] * size[1] * len(info["format"]):
+            return False
+        self.atlas = pg.image.frombuffer(self.pixels, size, info["format"])
+        self.images = info["images"]
+        return True
+
+
+if __name__ == "__main__":
+    from .loader import DATA_DIR
+
+    print(f"wrote {build(DATA_DIR)}")
@@ -0,0 +1,28 @@
+import pygame as pg
+
+from .ds import Rect
+
+
+class Camera:
+    """The part of the world shown on the screen.
+
+    The viewport is kept in whole pixels, so moving the camera never changes
+    how a sprite's position rounds onto the screen.
+    """
+
+    def __init__(
+        self, size: tuple[int, int], position: tuple[int, int] = (0, 0)
+    ) -> None:
+        self.viewport = pg.Rect(position, size)
+
+    @property
+    def offset(self) -> tuple[int, int]:
+        return self.viewport.topleft
+
+    def to_screen(self, rect: Rect | pg.Rect) -> pg.Rect:
+        if isinstance(rect, Rect):
+            rect = rect.to_pygame()
+        return rect.move(-self.viewport.x, -self.viewport.y)
+
+    def point_to_screen(self, x: float, y: float) -> tuple[float, float]:
+        return x - self.viewport.x, y - self.viewport.y
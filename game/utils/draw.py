@@ -2,6 +2,8 @@ from enum import Enum
 
 import pygame as pg
 
+from .font import render_text
+
 
 class HAlign(Enum):
     LEFT = 0
@@ -25,8 +27,7 @@ def text(
     valign: VAlign = VAlign.TOP,
     bold: bool = False,
 ):
-    font = pg.font.SysFont("FiraCode NF", size, bold=bold)
-    rendered = font.render(text, True, color)
+    rendered = render_text("FiraCode NF", size, text, color, bold)
     rect = rendered.get_rect()
     x, y = pos
     if halign == HAlign.CENTER:
@@ -1,17 +1,41 @@
 import random
+from collections.abc import Iterable, Iterator
 from typing import Generic, TypeVar, overload
 
 import pygame as pg
 
 Number = float
 E = TypeVar("E", bound=Number)
+T = TypeVar("T")
 
 
 class Vector2D(Generic[E]):
+    __slots__ = ("x", "y")
+
     def __init__(self, x: Number, y: Number) -> None:
         self.x = x
         self.y = y
 
+    def set(self, x: Number, y: Number) -> "Vector2D[E]":
+        self.x = x
+        self.y = y
+        return self
+
+    def iadd(self, other: E | "Vector2D[E]") -> "Vector2D[E]":
+        if isinstance(other, Vector2D):
+            return self.set(self.x + other.x, self.y + other.y)
+        return self.set(self.x + other, self.y + other)
+
+    def isub(self, other: E | "Vector2D[E]") -> "Vector2D[E]":
+        if isinstance(other, Vector2D):
+            return self.set(self.x - other.x, self.y - other.y)
+        return self.set(self.x - other, self.y - other)
+
+    def imul(self, other: E | "Vector2D[E]") -> "Vector2D[E]":
+        if isinstance(other, Vector2D):
+            return self.set(self.x * other.x, self.y * other.y)
+        return self.set(self.x * other, self.y * other)
+
     def __add__(self, other: E | "Vector2D[E]") -> "Vector2D[E]":
         if isinstance(other, Vector2D):
             return Vector2D(self.x + other.x, self.y + other.y)
@@ -51,7 +75,11 @@ class Vector2D(Generic[E]):
         return 2
 
     def __getitem__(self, index: int) -> E:
-        return (self.x, self.y)[index]  # type: ignore
+        if index == 0 or index == -2:
+            return self.x  # type: ignore
+        if index == 1 or index == -1:
+            return self.y  # type: ignore
+        raise IndexError("Vector2D index out of range")
 
     def __iter__(self):
         yield self.x
@@ -79,6 +107,14 @@ class Vector2D(Generic[E]):
 
         return Vector2D(*reflected_vector)
 
+    def ireflect(self, other: "Vector2D[E]") -> "Vector2D[E]":
+        """In-place ``reflect``, without allocating for axis-aligned planes."""
+        if other.x == 0:
+            return self.set(-self.x, self.y)
+        if other.y == 0:
+            return self.set(self.x, -self.y)
+        return self.set(*self.reflect(other))
+
     def draw_point(self, surface: pg.Surface, color: tuple[int, int, int]) -> None:
         pg.draw.circle(surface, color, (int(self.x), int(self.y)), 5)
 
@@ -105,12 +141,21 @@ class Vector2D(Generic[E]):
 
 
 class Rect:
+    __slots__ = ("x", "y", "w", "h")
+
     def __init__(self, x: Number, y: Number, w: Number, h: Number) -> None:
         self.x = x
         self.y = y
         self.w = w
         self.h = h
 
+    def set(self, x: Number, y: Number, w: Number, h: Number) -> "Rect":
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        return self
+
     @property
     def width(self) -> Number:
         return self.w
@@ -162,6 +207,20 @@ class Rect:
         h = min(self.y + self.h, other.y + other.h) - y
         return Rect(x, y, w, h)
 
+    def union(self, other: "Rect") -> "Rect":
+        x = min(self.x, other.x)
+        y = min(self.y, other.y)
+        w = max(self.x + self.w, other.x + other.w) - x
+        h = max(self.y + self.h, other.y + other.h) - y
+        return Rect(x, y, w, h)
+
+    def union_ip(self, other: "Rect") -> "Rect":
+        x = min(self.x, other.x)
+        y = min(self.y, other.y)
+        w = max(self.x + self.w, other.x + other.w) - x
+        h = max(self.y + self.h, other.y + other.h) - y
+        return self.set(x, y, w, h)
+
     def draw(self, surface: pg.Surface, color: tuple[int, int, int], **kwargs) -> None:
         pg.draw.rect(surface, color, self.to_pygame(), width=1, **kwargs)
 
@@ -187,5 +246,58 @@ class Rect:
         y = self.y + y  # type: ignore
         return Rect(x, y, self.w, self.h)
 
+    def move_ip(self, x: Number, y: Number) -> "Rect":
+        self.x += x
+        self.y += y
+        return self
+
     def __repr__(self):
         return f"<Rect {self.x}, {self.y}, {self.w}, {self.h}>"
+
+
+class DenseSet(Generic[T]):
+    """Identity set kept in a packed list, with O(1) add and swap-remove.
+
+    Removal moves the last item into the hole, so iteration order is not
+    insertion order.
+    """
+
+    __slots__ = ("items", "positions")
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        self.items: list[T] = []
+        # id(item) -> index in items
+        self.positions: dict[int, int] = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: T) -> None:
+        if id(item) in self.positions:
+            raise ValueError(f"{item} is already in the set")
+        self.positions[id(item)] = len(self.items)
+        self.items.append(item)
+
+    def remove(self, item: T) -> None:
+        index = self.positions.pop(id(item), None)
+        if index is None:
+            raise ValueError(f"{item} is not in the set")
+        last = self.items.pop()
+        if last is not item:
+            self.items[index] = last
+            self.positions[id(last)] = index
+
+    def clear(self) -> None:
+        self.items.clear()
+        self.positions.clear()
+
+    def __contains__(self, item: object) -> bool:
+        return id(item) in self.positions
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self) -> str:
+        return f"DenseSet({self.items})"
@@ -0,0 +1,85 @@
+from functools import cache, lru_cache
+
+import pygame as pg
+
+Color = tuple[int, int, int]
+
+
+@cache
+def get_font(name: str, size: int, bold: bool = False) -> pg.font.Font:
+    """SysFont does a system font lookup on every call, so keep the result."""
+    return pg.font.SysFont(name, size, bold=bold)
+
+
+@lru_cache(maxsize=256)
+def render_text(
+    name: str,
+    size: int,
+    text: str,
+    color: Color,
+    bold: bool = False,
+) -> pg.Surface:
+    """Rendered text surface, shared between callers; do not draw onto it."""
+    return get_font(name, size, bold).render(text, True, color)
+
+
+class GlyphAtlas:
+    """Printable ASCII of one font pre-rendered into a single surface.
+
+    Strings that change every frame (counters, timers) are drawn glyph by glyph
+    from the atlas instead of being rendered and cached as whole strings.
+    """
+
+    CHARSET = "".join(map(chr, range(32, 127)))
+
+    def __init__(self, name: str, size: int, color: Color, bold: bool = False):
+        self.font = get_font(name, size, bold)
+        self.color = color
+        self.height = self.font.get_linesize()
+        glyphs = [self.font.render(char, True, color) for char in self.CHARSET]
+        # transparent pixels carry the text colour so edges blend cleanly
+        self.surface = pg.Surface(
+            (sum(glyph.get_width() for glyph in glyphs), self.height), pg.SRCALPHA
+        )
+        self.surface.fill((*color, 0))
+        self.areas: dict[str, pg.Rect] = {}
+        self.advances: dict[str, int] = {}
+        x = 0
+        for char, glyph in zip(self.CHARSET, glyphs):
+            self.surface.blit(glyph, (x, 0))
+            self.areas[char] = pg.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            self.advances[char] = self.__advance(char, glyph)
+            x += glyph.get_width()
+        self.extra: dict[str, pg.Surface] = {}
+
+    def size(self, text: str) -> tuple[int, int]:
+        width = 0
+        for char in text:
+            if char not in self.advances:
+                self.__extra(char)
+            width += self.advances[char]
+        return width, self.height
+
+    def render(self, surface: pg.Surface, text: str, pos: tuple[int, int]) -> pg.Rect:
+        """Draw ``text`` with its top-left at ``pos`` and return the drawn area."""
+        x, y = pos
+        blits = []
+        for char in text:
+            area = self.areas.get(char)
+            if area is None:
+                blits.append((self.__extra(char), (x, y)))
+            else:
+                blits.append((self.surface, (x, y), area))
+            x += self.advances[char]
+        surface.blits(blits, doreturn=False)
+        return pg.Rect(pos[0], pos[1], x - pos[0], self.height)
+
+    def __extra(self, char: str) -> pg.Surface:
+        if char not in self.extra:
+            glyph = self.extra[char] = self.font.render(char, True, self.color)
+            self.advances[char] = self.__advance(char, glyph)
+        return self.extra[char]
+
+    def __advance(self, char: str, glyph: pg.Surface) -> int:
+        metrics = self.font.metrics(char)[0]
+        return metrics[4] if metrics else glyph.get_width()
@@ -1,7 +1,17 @@
+import io
+from collections.abc import Callable, Iterable
+from logging import getLogger
 from pathlib import Path
+from threading import Lock, Thread
+from typing import Any, Generic, TypeVar
 
 import pygame as pg
 
+from .bundle import Bundle
+
+T = TypeVar("T")
+log = getLogger(__name__)
+
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
 assert DATA_DIR.exists(), f"Data directory {DATA_DIR} does not exist"
 
@@ -11,30 +21,146 @@ def im_path(path: str | Path) -> Path:
 
 
 CACHE: dict[str, pg.Surface] = {}
+# built by `python -m game.utils.bundle`; images fall back to their files
+BUNDLE = Bundle(DATA_DIR.resolve())
+
+
+def decode_im(
+    path: str | Path, color_key: tuple[int, int, int] | int = -1
+) -> pg.Surface | None:
+    """The image at ``path`` decoded from its file, or None if the bundle has it.
+
+    Never touches the display, so it may run off the main thread.
+    """
+    path = (DATA_DIR / path).resolve()
+    assert path.exists(), f"File {path} does not exist"
+    if color_key == -1 and BUNDLE.has(path):
+        return None
+    return pg.image.load(str(path))
 
 
 def load_im(
     path: str | Path,
     scale: float = 1,
     color_key: tuple[int, int, int] | int = -1,
+    decoded: pg.Surface | None = None,
 ) -> pg.Surface:
+    """The image at ``path`` ready to blit; ``decoded`` is from ``decode_im``."""
     path = (DATA_DIR / path).resolve()
     if str(path) in CACHE:
         return CACHE[str(path)]
     assert path.exists(), f"File {path} does not exist"
-    image = pg.image.load(str(DATA_DIR / path))
+    # the bundle bakes the default colour key into alpha
+    image = BUNDLE.get(path) if color_key == -1 else None
+    if image is None:
+        image = decoded if decoded is not None else pg.image.load(str(path))
+        color_key = image.get_at((0, 0)) if color_key == -1 else color_key
+        image.set_colorkey(color_key)
+        if pg.display.get_surface() is not None:
+            image = image.convert_alpha()
     if scale != 1:
         image = pg.transform.scale(
             image,
             (int(image.get_width() * scale), int(image.get_height() * scale)),
         )
-    color_key = image.get_at((0, 0)) if color_key == -1 else color_key
-    image.set_colorkey(color_key)
     CACHE[str(path)] = image
     return image
 
 
-def load_audio(path: str | Path) -> pg.mixer.Sound:
+def read_audio(path: str | Path) -> bytes:
     path = (DATA_DIR / path).resolve()
     assert path.exists(), f"File {path} does not exist"
-    return pg.mixer.Sound(str(path))
+    return path.read_bytes()
+
+
+def load_audio(path: str | Path, data: bytes | None = None) -> pg.mixer.Sound:
+    """The sound at ``path``; ``data`` is its file's bytes if already read."""
+    if data is None:
+        data = read_audio(path)
+    return pg.mixer.Sound(file=io.BytesIO(data))
+
+
+NOT_DECODED = object()
+
+
+class Asset(Generic[T]):
+    """Handle to an asset that is loaded the first time it is used.
+
+    Loading has two stages. ``decode`` only reads and decodes data, so a
+    prefetch thread may run it. ``finish`` turns the decoded data into the
+    asset, e.g. converting it to the display format, on the main thread.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        decode: Callable[[], Any],
+        finish: Callable[[Any], T] | None = None,
+    ) -> None:
+        self.name = name
+        self.__decode = decode
+        self.__finish = finish
+        self.__decoded: Any = NOT_DECODED
+        self.__value: T | None = None
+        self.__lock = Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.__value is not None
+
+    def decode(self) -> Any:
+        if self.__decoded is NOT_DECODED:
+            # a prefetch thread may be decoding it already
+            with self.__lock:
+                if self.__decoded is NOT_DECODED:
+                    self.__decoded = self.__decode()
+        return self.__decoded
+
+    def get(self) -> T:
+        """The asset; call from the main thread only."""
+        if self.__value is None:
+            decoded = self.decode()
+            self.__value = decoded if self.__finish is None else self.__finish(decoded)
+            self.__decoded = None
+        return self.__value
+
+    def __repr__(self) -> str:
+        return f"Asset({self.name!r}, loaded={self.loaded})"
+
+
+def lazy_im(
+    path: str | Path,
+    scale: float = 1,
+    color_key: tuple[int, int, int] | int = -1,
+) -> Asset[pg.Surface]:
+    return Asset(
+        str(path),
+        lambda: decode_im(path, color_key),
+        lambda decoded: load_im(path, scale, color_key, decoded),
+    )
+
+
+def lazy_audio(path: str | Path) -> Asset[pg.mixer.Sound]:
+    return Asset(
+        str(path), lambda: read_audio(path), lambda data: load_audio(path, data)
+    )
+
+
+def prefetch(assets: Iterable[Asset]) -> Thread:
+    """Decode ``assets`` on a daemon thread so first uses do not block.
+
+    Only the decoding happens there; each asset is finished on the main
+    thread when it is first used.
+    """
+
+    def load():
+        for asset in assets:
+            try:
+                asset.decode()
+            except Exception:
+                # left unloaded, so the first use raises it where it matters
+                log.warning("could not prefetch %s", asset.name, exc_info=True)
+
+    thread = Thread(target=load, name="prefetch", daemon=True)
+    thread.start()
+    return thread
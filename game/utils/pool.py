@@ -0,0 +1,85 @@
+import weakref
+from collections.abc import Callable
+from typing import Generic, NamedTuple, Protocol, TypeVar
+
+
+class Poolable(Protocol):
+    def reset(self, *args, **kwargs) -> None:
+        """Reinitialise a reused instance as ``__init__(*args, **kwargs)`` would."""
+
+    def park(self) -> None:
+        """Stop whatever the instance does on its own while it is pooled."""
+
+
+T = TypeVar("T", bound=Poolable)
+
+
+class PoolStats(NamedTuple):
+    live: int
+    free: int
+    # most instances live at once
+    high_water: int
+    created: int
+    reused: int
+    # released while the free list was full
+    dropped: int
+
+
+class Pool(Generic[T]):
+    """Free list of despawned instances, reset and handed out again."""
+
+    def __init__(self, create: Callable[..., T], capacity: int = 64) -> None:
+        self.create = create
+        # most instances kept on the free list
+        self.capacity = capacity
+        self.free: list[T] = []
+        # id(instance) -> the instance, while it is out of the pool; weak, so
+        # instances of a game that is dropped without releasing them still
+        # stop counting once they are collected
+        self.out: dict[int, weakref.ref[T]] = {}
+        self.high_water = 0
+        self.created = 0
+        self.reused = 0
+        self.dropped = 0
+
+    def acquire(self, *args, **kwargs) -> T:
+        if self.free:
+            instance = self.free.pop()
+            instance.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            instance = self.create(*args, **kwargs)
+            self.created += 1
+        key = id(instance)
+        self.out[key] = weakref.ref(instance, lambda _: self.out.pop(key, None))
+        self.high_water = max(self.high_water, self.live)
+        return instance
+
+    def release(self, instance: T) -> None:
+        """Take ``instance`` back; ignored unless it came from this pool and
+        is still out."""
+        if self.out.pop(id(instance), None) is None:
+            return
+        instance.park()
+        if len(self.free) < self.capacity:
+            self.free.append(instance)
+        else:
+            self.dropped += 1
+
+    @property
+    def live(self) -> int:
+        return len(self.out)
+
+    @property
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            self.live,
+            len(self.free),
+            self.high_water,
+            self.created,
+            self.reused,
+            self.dropped,
+        )
+
+    def __repr__(self) -> str:
+        return f"Pool({self.create.__name__}, {self.stats})"
@@ -0,0 +1,138 @@
+"""Named timing spans per frame, kept in a ring buffer.
+
+    with PROFILER.frame():
+        with PROFILER.span("physics"):
+            ...
+
+While disabled, ``frame`` and ``span`` return a shared no-op context manager.
+Spans marked ``detail`` are only recorded when the profiler is ``detailed``.
+"""
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+NULL_SPAN = nullcontext()
+
+
+class SpanRecord(NamedTuple):
+    name: str
+    start: float
+    end: float
+    depth: int
+
+
+class Summary(NamedTuple):
+    """Milliseconds per frame spent in a span, over the frames that had it."""
+
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+
+
+class Span:
+    __slots__ = ("profiler", "name", "start", "depth")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.depth = self.profiler.depth
+        self.profiler.depth += 1
+        self.start = time.perf_counter()
+
+    def __exit__(self, *_) -> None:
+        end = time.perf_counter()
+        self.profiler.depth -= 1
+        self.profiler.current.append(SpanRecord(self.name, self.start, end, self.depth))
+
+
+class FrameSpan(Span):
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        self.profiler.current = []
+        super().__enter__()
+
+    def __exit__(self, *_) -> None:
+        super().__exit__()
+        self.profiler.frames.append(self.profiler.current)
+        self.profiler.current = None
+
+
+class Profiler:
+    FRAME = "frame"
+
+    def __init__(
+        self,
+        capacity: int = 600,
+        enabled: bool = False,
+        detailed: bool = False,
+    ) -> None:
+        self.enabled = enabled
+        self.detailed = detailed
+        # spans of the most recent frames, oldest first
+        self.frames: deque[list[SpanRecord]] = deque(maxlen=capacity)
+        # spans of the frame in progress, or None outside a frame
+        self.current: list[SpanRecord] | None = None
+        self.depth = 0
+        self.origin = time.perf_counter()
+
+    def frame(self) -> Span | nullcontext:
+        if not self.enabled:
+            return NULL_SPAN
+        return FrameSpan(self, self.FRAME)
+
+    def span(self, name: str, detail: bool = False) -> Span | nullcontext:
+        if self.current is None or (detail and not self.detailed):
+            return NULL_SPAN
+        return Span(self, name)
+
+    def clear(self, capacity: int | None = None) -> None:
+        self.frames = deque(maxlen=capacity or self.frames.maxlen)
+        self.origin = time.perf_counter()
+
+    def durations(self) -> dict[str, np.ndarray]:
+        """Seconds spent in each span, summed per frame that had it."""
+        totals: dict[str, list[float]] = {}
+        for spans in self.frames:
+            frame: dict[str, float] = {}
+            for span in spans:
+                frame[span.name] = frame.get(span.name, 0) + span.end - span.start
+            for name, duration in frame.items():
+                totals.setdefault(name, []).append(duration)
+        return {name: np.array(values) for name, values in totals.items()}
+
+    def summary(self) -> dict[str, Summary]:
+        result = {}
+        for name, values in self.durations().items():
+            p50, p95, p99 = np.percentile(values * 1000, (50, 95, 99))
+            result[name] = Summary(float(values.mean() * 1000), p50, p95, p99)
+        return result
+
+    def export(self, path: str | Path) -> None:
+        """Write the buffered frames as Chrome trace-event JSON."""
+        events = [
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": (span.start - self.origin) * 1e6,
+                "dur": (span.end - span.start) * 1e6,
+                "pid": 0,
+                "tid": 0,
+            }
+            for spans in self.frames
+            for span in spans
+        ]
+        Path(path).write_text(
+            json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
+        )
+
+
+PROFILER = Profiler()
@@ -1,5 +1,50 @@
 import pygame as pg
 
+from .ds import Rect
+
+ETA = 1e-6
+
 
 def make_rect(x: float, y: float, w: float, h: float) -> pg.Rect:
     return pg.Rect(round(x), round(y), round(w), round(h))
+
+
+def prevent_zero(x: float) -> float:
+    return x if abs(x) > ETA else ETA if x > 0 else -ETA
+
+
+def contact_times(a: Rect, b: Rect, v_x: float, v_y: float) -> tuple[float, float]:
+    """When ``a``, moving at ``(v_x, v_y)`` relative to ``b``, starts and stops
+    overlapping it; they never overlap if it starts after it stops."""
+    v_x = prevent_zero(v_x)
+    v_y = prevent_zero(v_y)
+    a_left, a_top = a.x, a.y
+    b_left, b_top = b.x, b.y
+    t_x_enter = (b_left - (a_left + a.w)) / v_x
+    t_x_exit = (b_left + b.w - a_left) / v_x
+    t_y_enter = (b_top - (a_top + a.h)) / v_y
+    t_y_exit = (b_top + b.h - a_top) / v_y
+    return (
+        max(min(t_x_enter, t_x_exit), min(t_y_enter, t_y_exit)),
+        min(max(t_x_enter, t_x_exit), max(t_y_enter, t_y_exit)),
+    )
+
+
+def sweep(a0: Rect, a1: Rect, b0: Rect, b1: Rect) -> float | None:
+    """Time of impact of ``a`` moving from ``a0`` to ``a1`` with ``b`` moving
+    from ``b0`` to ``b1``, as a fraction of the move.
+
+    0 if they overlap from the start, None if they never overlap.
+    """
+    d_x = (a1.x - a0.x) - (b1.x - b0.x)
+    d_y = (a1.y - a0.y) - (b1.y - b0.y)
+    # on an axis without relative motion they must overlap throughout;
+    # contact_times would nudge the motion and could count touching edges
+    if d_x == 0 and not (a0.x < b0.x + b0.w and b0.x < a0.x + a0.w):
+        return None
+    if d_y == 0 and not (a0.y < b0.y + b0.h and b0.y < a0.y + a0.h):
+        return None
+    enter, exit = contact_times(a0, b0, d_x, d_y)
+    if enter >= exit or exit <= 0 or enter >= 1:
+        return None
+    return max(enter, 0.0)
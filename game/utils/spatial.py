@@ -0,0 +1,200 @@
+from collections.abc import Iterator
+from math import ceil, floor
+from random import Random
+from typing import Generic, TypeVar
+
+from .ds import Rect
+
+T = TypeVar("T")
+Cell = tuple[int, int]
+Cells = tuple[int, int, int, int]
+
+
+class SpatialHash(Generic[T]):
+    """Uniform grid that buckets items by the cells their rect covers."""
+
+    def __init__(self, cell_size: int) -> None:
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], dict[int, T]] = {}
+        self.bounds: dict[int, Cells] = {}
+
+    def cover(self, rect: Rect) -> Cells:
+        size = self.cell_size
+        return (
+            floor(rect.x / size),
+            floor(rect.y / size),
+            floor((rect.x + rect.w) / size),
+            floor((rect.y + rect.h) / size),
+        )
+
+    def insert(self, item: T, rect: Rect) -> None:
+        key = id(item)
+        if key in self.bounds:
+            raise ValueError(f"{item} is already in the grid")
+        bounds = self.cover(rect)
+        self.bounds[key] = bounds
+        self.__link(key, item, bounds)
+
+    def move(self, item: T, rect: Rect) -> bool:
+        """Re-bucket ``item`` if its rect moved to other cells."""
+        key = id(item)
+        bounds = self.cover(rect)
+        old = self.bounds[key]
+        if bounds == old:
+            return False
+        self.__unlink(key, old)
+        self.bounds[key] = bounds
+        self.__link(key, item, bounds)
+        return True
+
+    def remove(self, item: T) -> None:
+        key = id(item)
+        if key not in self.bounds:
+            raise ValueError(f"{item} is not in the grid")
+        self.__unlink(key, self.bounds.pop(key))
+
+    def query(self, item: T) -> Iterator[T]:
+        """Yield every other item sharing at least one cell with ``item``."""
+        key = id(item)
+        x0, y0, x1, y1 = self.bounds[key]
+        if x0 == x1 and y0 == y1:
+            for other_key, other in self.cells[x0, y0].items():
+                if other_key != key:
+                    yield other
+            return
+        seen = {key}
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                for other_key, other in self.cells[x, y].items():
+                    if other_key not in seen:
+                        seen.add(other_key)
+                        yield other
+
+    def search(self, rect: Rect) -> Iterator[T]:
+        """Yield every item sharing at least one cell with ``rect``, once."""
+        x0, y0, x1, y1 = self.cover(rect)
+        seen = set()
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                for key, item in self.cells.get((x, y), {}).items():
+                    if key not in seen:
+                        seen.add(key)
+                        yield item
+
+    def __contains__(self, item: T) -> bool:
+        return id(item) in self.bounds
+
+    def __link(self, key: int, item: T, bounds: Cells) -> None:
+        x0, y0, x1, y1 = bounds
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                self.cells.setdefault((x, y), {})[key] = item
+
+    def __unlink(self, key: int, bounds: Cells) -> None:
+        x0, y0, x1, y1 = bounds
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                cell = self.cells[x, y]
+                del cell[key]
+                if not cell:
+                    del self.cells[x, y]
+
+
+class FreeSpace:
+    """Grid cells in which a rect of ``size`` fits anywhere, sampled in O(1).
+
+    A cell is an anchor while a rect at any integer position in it stays
+    inside ``bounds`` and off every cell a blocked rect covers. Blocking and
+    unblocking rects only revisits the anchors near them.
+    """
+
+    def __init__(self, bounds: Rect, cell_size: int, size: tuple[int, int]) -> None:
+        self.cell_size = cell_size
+        w, h = size
+        # cells reached by a rect placed anywhere in its anchor cell
+        self.footprint = (
+            ceil((cell_size - 1 + w) / cell_size),
+            ceil((cell_size - 1 + h) / cell_size),
+        )
+        self.columns = range(
+            ceil(bounds.x / cell_size),
+            floor((bounds.x + bounds.w - w + 1) / cell_size),
+        )
+        self.rows = range(
+            ceil(bounds.y / cell_size),
+            floor((bounds.y + bounds.h - h + 1) / cell_size),
+        )
+        # cell -> how many blocked rects cover it
+        self.blocked: dict[Cell, int] = {}
+        self.anchors: list[Cell] = []
+        # anchor -> its index in anchors
+        self.positions: dict[Cell, int] = {}
+        for x in self.columns:
+            for y in self.rows:
+                self.__add(x, y)
+
+    def block(self, rect: Rect) -> None:
+        fw, fh = self.footprint
+        for x, y in self.cover(rect):
+            count = self.blocked.get((x, y), 0)
+            self.blocked[x, y] = count + 1
+            if count:
+                continue
+            for ax in range(x - fw + 1, x + 1):
+                for ay in range(y - fh + 1, y + 1):
+                    self.__discard(ax, ay)
+
+    def unblock(self, rect: Rect) -> None:
+        fw, fh = self.footprint
+        for x, y in self.cover(rect):
+            count = self.blocked.pop((x, y))
+            if count > 1:
+                self.blocked[x, y] = count - 1
+                continue
+            for ax in range(x - fw + 1, x + 1):
+                for ay in range(y - fh + 1, y + 1):
+                    if ax in self.columns and ay in self.rows and self.__clear(ax, ay):
+                        self.__add(ax, ay)
+
+    def cover(self, rect: Rect) -> Iterator[Cell]:
+        """Cells overlapped by ``rect``; touching a cell's edge does not count."""
+        size = self.cell_size
+        for x in range(floor(rect.x / size), ceil((rect.x + rect.w) / size)):
+            for y in range(floor(rect.y / size), ceil((rect.y + rect.h) / size)):
+                yield x, y
+
+    def sample(self, rng: Random) -> tuple[int, int] | None:
+        """A free position for the top left of the rect, or None if there is none."""
+        if not self.anchors:
+            return None
+        x, y = self.anchors[rng.randrange(len(self.anchors))]
+        size = self.cell_size
+        return x * size + rng.randrange(size), y * size + rng.randrange(size)
+
+    def __clear(self, x: int, y: int) -> bool:
+        fw, fh = self.footprint
+        return not any(
+            (cx, cy) in self.blocked
+            for cx in range(x, x + fw)
+            for cy in range(y, y + fh)
+        )
+
+    def __add(self, x: int, y: int) -> None:
+        if (x, y) not in self.positions:
+            self.positions[x, y] = len(self.anchors)
+            self.anchors.append((x, y))
+
+    def __discard(self, x: int, y: int) -> None:
+        index = self.positions.pop((x, y), None)
+        if index is None:
+            return
+        last = self.anchors.pop()
+        if last != (x, y):
+            self.anchors[index] = last
+            self.positions[last] = index
+
+    def __contains__(self, cell: Cell) -> bool:
+        return cell in self.positions
+
+    def __len__(self) -> int:
+        return len(self.anchors)
@@ -1,53 +1,68 @@
 import pygame as pg
 
-from .interfaces import Colliable, CollisionCallback, PlayInstance
-from .utils import Rect, Vector2D, load_im
+from .interfaces import (
+    Colliable,
+    CollisionCallback,
+    PlayInstance,
+    RenderLayer,
+    noop_update,
+)
+from .utils import Camera, Rect, Vector2D, lazy_im
 
 
 class Wall(PlayInstance):
-    TEXTURE = load_im("wall.jpg", scale=48 / 60)
-    WIDTH, HEIGHT = TEXTURE.get_size()
+    STATIC = True
+    RENDER_LAYER = RenderLayer.BACKGROUND
+    TEXTURE = lazy_im("wall.jpg", scale=48 / 60)
 
-    def __init__(self, rect: pg.Rect, sticy: bool = False) -> None:
+    def __init__(
+        self,
+        rect: pg.Rect,
+        sticy: bool = False,
+        surface: pg.Surface | None = None,
+        position: tuple[int, int] | None = None,
+    ) -> None:
         self.pg_rect = rect
+        self.rect = Rect.from_pygame(rect)
+        self.velocity = Vector2D(0, 0)
+        self.sticky = sticy
+        # a baked level hands over the visible part of the wall, already drawn
+        self.position = rect.topleft if position is None else position
+        if surface is not None:
+            self.surface = surface
+            return
         self.surface = pg.Surface(rect.size)
         self.surface.fill((0, 0, 0))
-        self.sticky = sticy
 
-        for x in range(0, rect.width, Wall.WIDTH):
-            for y in range(0, rect.height, Wall.HEIGHT):
-                self.surface.blit(Wall.TEXTURE, (x, y))
+        texture = Wall.TEXTURE.get()
+        width, height = texture.get_size()
+        for x in range(0, rect.width, width):
+            for y in range(0, rect.height, height):
+                self.surface.blit(texture, (x, y))
 
     def get_rect(self) -> Rect:
-        return Rect.from_pygame(self.pg_rect)
+        return self.rect
 
     def get_velocity(self) -> Vector2D:
-        return Vector2D(0, 0)
+        return self.velocity
 
     def collide(self, other: Colliable) -> bool:
-        return other.get_rect().collide(self.get_rect())
+        return other.get_rect().collide(self.rect)
 
     def get_callbacks(self) -> list[tuple[CollisionCallback, type[Colliable]]]:
         return []
 
-    def render(self, surface: pg.Surface) -> None:
-        surface.blit(self.surface, self.pg_rect)
+    def render(self, surface: pg.Surface, camera: Camera) -> None:
+        surface.blit(self.surface, camera.point_to_screen(*self.position))
         if self.sticky:
+            rect = camera.to_screen(self.pg_rect)
+            pg.draw.rect(surface, (0, 255, 0), (rect.x, rect.y, 2, rect.height))
             pg.draw.rect(
                 surface,
                 (0, 255, 0),
-                (self.pg_rect.x, self.pg_rect.y, 2, self.pg_rect.height),
-            )
-            pg.draw.rect(
-                surface,
-                (0, 255, 0),
-                (
-                    self.pg_rect.x + self.pg_rect.width - 2,
-                    self.pg_rect.y,
-                    2,
-                    self.pg_rect.height,
-                ),
+                (rect.x + rect.width - 2, rect.y, 2, rect.height),
             )
 
+    @noop_update
     def update(self, dt: float) -> None:
         """Wall does not move, so no need to update it."""
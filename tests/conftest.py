@@ -0,0 +1,24 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import gc
+
+import pygame as pg
+import pytest
+
+from game.command import commands
+from game.constants import SIZE
+from game.game import Game
+from game.headless import ScriptedInput
+
+
+@pytest.fixture
+def game():
+    pg.init()
+    surface = pg.display.set_mode(SIZE, pg.SRCALPHA)
+    yield Game(surface, lambda *_: None, 0, ScriptedInput(0), music=False)
+    # bodies of the game live in the shared physics world
+    commands.clear()
+    gc.collect()
@@ -0,0 +1,19 @@
+from game.burger import BurgerLayer
+from game.game import Game
+from game.interfaces import Collision
+
+
+def test_layer_caught_after_hitting_a_wall_stays_on_the_burger(game):
+    game.spawn_burger()
+    (layer,) = (i for i in game.entities if isinstance(i, BurgerLayer))
+    wall = next(iter(game.walls))
+
+    # both in one tick: the wall first, while the layer is still loose
+    layer.wall_collide(Collision(layer, wall))
+    game.player.layer_collide(Collision(game.player, layer))
+    game.step(1 / Game.TICK_RATE, render=False)
+
+    assert layer in game.entities
+    assert layer in game.player.burger.layers
+    assert layer not in BurgerLayer.POOL.free
+
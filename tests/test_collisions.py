@@ -0,0 +1,68 @@
+from game.interfaces import Collision, CollisionHandler, batched
+from game.utils import Rect, Vector2D
+
+
+class Wall:
+    STATIC = True
+
+    def __init__(self, rect: Rect) -> None:
+        self.rect = rect
+
+    def get_rect(self) -> Rect:
+        return self.rect
+
+    def get_previous_rect(self) -> Rect:
+        return self.rect
+
+    def get_velocity(self) -> Vector2D:
+        return Vector2D(0, 0)
+
+    def collide(self, other) -> bool:
+        return self.rect.collide(other.get_rect())
+
+    def get_callbacks(self):
+        return []
+
+
+class Box(Wall):
+    STATIC = False
+
+    def __init__(self, name: str, log: list[str], start: Rect, end: Rect) -> None:
+        super().__init__(end)
+        self.name = name
+        self.log = log
+        self.start = start
+
+    def get_previous_rect(self) -> Rect:
+        return self.start
+
+    def rewind(self, toi: float) -> None:
+        pass
+
+    def hit(self, collision: Collision) -> None:
+        self.log.append(self.name)
+
+    @staticmethod
+    def hit_all(collisions: list[Collision], dt: float) -> None:
+        for collision in collisions:
+            collision.a.log.append(collision.a.name)
+
+    @batched(hit_all)
+    def hit_batched(self, collision: Collision) -> None:
+        self.hit(collision)
+
+
+def test_batched_callbacks_run_in_time_of_impact_order():
+    handler = CollisionHandler()
+    log: list[str] = []
+    wall = Wall(Rect(100, 0, 50, 100))
+    handler.add(wall)
+    # each box moves 100 to the right and reaches the wall later than the last
+    for row, (name, x, batch) in enumerate(
+        (("a", 80, True), ("b", 60, False), ("c", 40, True))
+    ):
+        box = Box(name, log, Rect(x, row * 20, 10, 10), Rect(x + 100, row * 20, 10, 10))
+        handler.add(box)
+        handler.register(box.hit_batched if batch else box.hit, box, Wall)
+    handler.update(1 / 60)
+    assert log == ["a", "b", "c"]
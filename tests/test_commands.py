@@ -0,0 +1,46 @@
+from game.command import AddInstanceCMD, CommandQueue, RemoveInstanceCMD
+from game.entity import Entities
+
+
+class Thing:
+    pass
+
+
+def test_duplicate_commands_are_coalesced():
+    queue = CommandQueue()
+    a, b = Thing(), Thing()
+    first = RemoveInstanceCMD(a)
+    queue.issue(first)
+    queue.issue(RemoveInstanceCMD(a))
+    queue.issue(RemoveInstanceCMD(b))
+    queue.issue(AddInstanceCMD(a, b))
+    queue.issue(AddInstanceCMD(a, b))
+    drained = queue.drain()
+    assert len(drained) == 3
+    assert drained[0] is first
+    assert len(queue) == 0
+
+
+def test_cancel_drops_a_queued_remove():
+    queue = CommandQueue()
+    a, b = Thing(), Thing()
+    queue.issue(RemoveInstanceCMD(a))
+    queue.issue(RemoveInstanceCMD(b))
+    queue.cancel(RemoveInstanceCMD(a))
+    # cancelling what is not queued is not an error
+    queue.cancel(RemoveInstanceCMD(a))
+    assert [cmd.instance for cmd in queue.drain()] == [b]
+
+
+def test_stale_handle_resolves_to_none_after_its_slot_is_reused():
+    entities = Entities[Thing]()
+    old = Thing()
+    handle = entities.add(old)
+    assert entities.get(handle) is old
+    entities.remove(old)
+    new = Thing()
+    reused = entities.add(new)
+    assert reused.index == handle.index
+    assert entities.get(handle) is None
+    assert entities.get(reused) is new
+    assert old not in entities
@@ -0,0 +1,18 @@
+from game.entity import Entities
+
+
+class Thing:
+    pass
+
+
+def test_query_yields_live_instances_of_a_class():
+    entities = Entities[object]()
+    things = [Thing() for _ in range(3)]
+    for thing in things:
+        entities.add(thing)
+    other = object()
+    entities.add(other)
+    entities.remove(things[0])
+    assert sorted(map(id, entities.query(Thing))) == sorted(map(id, things[1:]))
+    assert list(entities.query(int)) == []
+    assert len(list(entities)) == 3
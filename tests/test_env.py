@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from game.env import GameEnv, VectorEnv
+
+
+def test_rollout_matches_stepping_tick_by_tick():
+    actions = np.random.default_rng(0).integers(GameEnv.ACTIONS, size=(8, 2))
+    with VectorEnv(2, horizon=8) as env:
+        env.reset(3)
+        observations, rewards, dones = (a.copy() for a in env.rollout(actions))
+        env.reset(3)
+        for tick, action in enumerate(actions):
+            observation, reward, done = env.step(action)
+            assert np.array_equal(observation, observations[tick])
+            assert np.array_equal(reward, rewards[tick])
+            assert np.array_equal(done, dones[tick])
+        with pytest.raises(ValueError):
+            env.rollout(np.zeros((9, 2), dtype=np.uint8))
@@ -0,0 +1,14 @@
+from game.level import merge, parse
+
+
+def test_blank_lines_within_the_grid_are_empty_rows():
+    settings, rows = parse("\ntile 16\n\n#..#\n   \n#..#\n\n")
+    assert settings["tile"] == [16]
+    assert rows == ["#..#", "", "#..#"]
+    # the columns are split by the empty row, not merged across it
+    assert merge(rows) == [
+        (0, 0, 1, 1, "#"),
+        (3, 0, 1, 1, "#"),
+        (0, 2, 1, 1, "#"),
+        (3, 2, 1, 1, "#"),
+    ]
@@ -0,0 +1,43 @@
+import gc
+
+from game.monster import Monster
+from game.utils import Pool
+
+
+class Item:
+    def __init__(self) -> None:
+        self.parked = False
+
+    def reset(self) -> None:
+        self.parked = False
+
+    def park(self) -> None:
+        self.parked = True
+
+
+def test_release_counts_each_instance_once():
+    pool = Pool(Item)
+    item = pool.acquire()
+    pool.release(item)
+    pool.release(item)
+    pool.release(Item())
+    assert pool.live == 0
+    assert pool.free == [item]
+    assert item.parked
+
+
+def test_collected_instances_stop_counting():
+    pool = Pool(Item)
+    pool.acquire()
+    gc.collect()
+    assert pool.live == 0
+
+
+def test_released_body_stays_put():
+    monster = Monster.POOL.acquire()
+    Monster.POOL.release(monster)
+    position = tuple(monster.rb.position)
+    monster.rb.world.update(1 / 60)
+    assert tuple(monster.rb.position) == position
+    assert Monster.POOL.acquire() is monster
+    assert monster.rb.gravity
@@ -0,0 +1,68 @@
+import random
+
+from game.utils import FreeSpace, Rect, SpatialHash
+
+
+class Item:
+    def __init__(self, rect: Rect) -> None:
+        self.rect = rect
+
+
+def test_spatial_hash_moves_and_removes_items():
+    grid = SpatialHash[Item](10)
+    a, b = Item(Rect(0, 0, 5, 5)), Item(Rect(50, 50, 5, 5))
+    grid.insert(a, a.rect)
+    grid.insert(b, b.rect)
+    assert list(grid.query(a)) == []
+
+    assert grid.move(b, Rect(2, 2, 5, 5))
+    assert not grid.move(b, Rect(3, 3, 5, 5))
+    assert list(grid.query(a)) == [b]
+
+    grid.remove(b)
+    assert b not in grid
+    assert list(grid.query(a)) == []
+    # emptied cells are dropped rather than left behind
+    assert set(grid.cells) == {(0, 0)}
+
+
+def test_spatial_hash_finds_large_rects_across_cells_once():
+    grid = SpatialHash[Item](10)
+    floor = Item(Rect(-100, 90, 400, 30))
+    grid.insert(floor, floor.rect)
+    items = [Item(Rect(x, 95, 4, 4)) for x in (-95, 0, 150, 295)]
+    for item in items:
+        grid.insert(item, item.rect)
+    assert list(grid.query(floor)) == items
+    for item in items:
+        assert list(grid.query(item)) == [floor]
+    assert list(grid.search(Rect(-200, 0, 600, 200))).count(floor) == 1
+    assert list(grid.search(Rect(0, 0, 50, 50))) == []
+
+
+def test_free_space_never_samples_a_blocked_cell():
+    size = (30, 20)
+    space = FreeSpace(Rect(0, 0, 200, 200), 10, size)
+    walls = [Rect(40, 40, 60, 10), Rect(120, 0, 10, 200), Rect(0, 150, 120, 50)]
+    for wall in walls:
+        space.block(wall)
+    # blocking a rect twice needs two unblocks to free it
+    space.block(walls[0])
+    space.unblock(walls[0])
+
+    rng = random.Random(0)
+    for _ in range(2000):
+        x, y = space.sample(rng)
+        rect = Rect(x, y, *size)
+        assert 0 <= x and x + rect.w <= 200 and 0 <= y and y + rect.h <= 200
+        assert not any(rect.collide(wall) for wall in walls)
+
+    for wall in walls:
+        space.unblock(wall)
+    assert len(space) == len(FreeSpace(Rect(0, 0, 200, 200), 10, size))
+
+
+def test_free_space_is_empty_when_fully_blocked():
+    space = FreeSpace(Rect(0, 0, 100, 100), 10, (10, 10))
+    space.block(Rect(0, 0, 100, 100))
+    assert space.sample(random.Random(0)) is None